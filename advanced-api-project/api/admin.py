@@ -13,11 +13,15 @@ class AuthorAdmin(admin.ModelAdmin):
     search_fields = ["name"]
     ordering = ["name"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_book_counts()
+
     def book_count(self, obj):
         """Display the number of books by this author."""
-        return obj.books.count()
+        return obj.book_count
 
     book_count.short_description = "Number of Books"
+    book_count.admin_order_field = "book_count"
 
 
 @admin.register(Book)
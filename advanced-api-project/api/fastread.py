@@ -0,0 +1,154 @@
+"""
+Read-only fast path for list endpoints.
+
+For every row, DRF walks the serializer's field objects, resolves each
+source on a model instance and calls the field's to_representation(). For
+plain columns that is nearly all overhead. A ReadPlan is worked out once per
+serializer class instead: each field becomes a ``values()`` column plus a
+converter, and row dicts are turned into output dicts directly. The output
+is identical to ``serializer_class(instances, many=True).data``.
+
+Serializers using anything the plan does not understand (custom field
+classes, method fields without a ``read_columns`` entry, ...) get no plan and
+keep going through DRF.
+"""
+
+from functools import lru_cache
+
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Field classes whose to_representation() is a plain cast (None: as is).
+# Exact classes only, since subclasses may format values differently.
+CONVERTERS = {
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.CharField: str,
+    serializers.ReadOnlyField: None,
+    PrimaryKeyRelatedField: None,
+}
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _converter(field):
+    if type(field) is serializers.BigIntegerField:
+        # BigAutoField primary keys; optionally rendered as strings
+        coerce = getattr(field, "coerce_to_string", api_settings.COERCE_BIGINT_TO_STRING)
+        return str if coerce else int
+    if type(field) not in CONVERTERS or getattr(field, "pk_field", None):
+        raise _Unsupported(field)
+    return CONVERTERS[type(field)]
+
+
+@lru_cache(maxsize=None)
+def get_read_plan(serializer_class):
+    """The ReadPlan for ``serializer_class``, or None if it needs DRF."""
+    try:
+        return ReadPlan(serializer_class)
+    except _Unsupported:
+        return None
+
+
+class ReadPlan:
+    """
+    Precompiled field accessors for one serializer class.
+
+    A serializer may list extra output keys in ``read_columns`` as
+    ``{key: column}``: method fields (which the plan cannot run) and keys added
+    by an overridden ``to_representation()`` (which must declare every key it
+    adds). Columns there are usually annotations the view's queryset provides.
+    """
+
+    def __init__(self, serializer_class):
+        model = serializer_class.Meta.model
+        read_columns = dict(getattr(serializer_class, "read_columns", {}))
+        owner = next(
+            klass for klass in serializer_class.__mro__ if "to_representation" in vars(klass)
+        )
+        if owner is not serializers.Serializer and "read_columns" not in vars(owner):
+            raise _Unsupported(serializer_class)
+
+        self.pk_column = model._meta.pk.attname
+        self.columns = [self.pk_column]
+        self.steps = []  # (key, column, converter)
+        self.nested = []  # (key, child plan, related model, foreign key column)
+        for key, field in serializer_class().fields.items():
+            if key in read_columns:
+                self.add_column(key, read_columns.pop(key), None)
+            elif field.write_only:
+                continue
+            elif isinstance(field, serializers.ListSerializer):
+                self.add_nested(key, field, model)
+            else:
+                self.add_column(key, "__".join(field.source_attrs), _converter(field))
+        # Keys appended by to_representation() come after the fields
+        for key, column in read_columns.items():
+            self.add_column(key, column, None)
+
+    def add_column(self, key, column, converter):
+        if column not in self.columns:
+            self.columns.append(column)
+        self.steps.append((key, column, converter))
+
+    def add_nested(self, key, field, model):
+        child = get_read_plan(type(field.child))
+        relation = model._meta.get_field(field.source)
+        if child is None or not relation.one_to_many:
+            raise _Unsupported(key)
+        self.nested.append((key, child, relation.related_model, relation.field.attname))
+        self.steps.append((key, None, None))
+
+    def values(self, queryset):
+        """``queryset`` as the row dicts represent() expects."""
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def represent(self, rows):
+        """Output dicts for ``rows``; one extra query per nested field."""
+        rows = list(rows)
+        children = {
+            key: self.fetch_children(child, model, fk_column, rows)
+            for key, child, model, fk_column in self.nested
+        }
+        pk_column, steps = self.pk_column, self.steps
+        output = []
+        for row in rows:
+            item = {}
+            for key, column, converter in steps:
+                if column is None:
+                    item[key] = children[key].get(row[pk_column], [])
+                    continue
+                value = row[column]
+                item[key] = value if value is None or converter is None else converter(value)
+            output.append(item)
+        return output
+
+    def fetch_children(self, child, model, fk_column, rows):
+        # Same rows, in the same (default) order, as prefetch_related() would load
+        related = list(
+            model._default_manager.filter(
+                **{f"{fk_column}__in": [row[self.pk_column] for row in rows]}
+            ).values(*dict.fromkeys([fk_column, *child.columns]))
+        )
+        by_parent = {}
+        for parent, item in zip((row[fk_column] for row in related), child.represent(related)):
+            by_parent.setdefault(parent, []).append(item)
+        return by_parent
+
+
+class ReadPlanListMixin:
+    """List views: serialize through the serializer's ReadPlan when it has one."""
+
+    def list(self, request, *args, **kwargs):
+        plan = get_read_plan(self.get_serializer_class())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+        rows = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.represent(page))
+        return Response(plan.represent(rows))
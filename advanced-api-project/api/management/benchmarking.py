@@ -0,0 +1,35 @@
+"""Helpers shared by the benchmark_* management commands."""
+
+import time
+
+from api.models import Author, Book
+
+BOOKS_PER_AUTHOR = 10
+
+
+def generate_books(rows):
+    """Insert ``rows`` books spread over ``rows / BOOKS_PER_AUTHOR`` authors."""
+    authors = Author.objects.bulk_create(
+        Author(name=f"Benchmark author {i}") for i in range(max(rows // BOOKS_PER_AUTHOR, 1))
+    )
+    Book.objects.bulk_create(
+        (
+            Book(
+                title=f"Benchmark book {i}",
+                author=authors[i % len(authors)],
+                publication_year=1900 + i % 120,
+            )
+            for i in range(rows)
+        ),
+        batch_size=1000,
+    )
+
+
+def best_time(repeat, run):
+    """Fastest wall time of ``repeat`` calls to ``run``."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
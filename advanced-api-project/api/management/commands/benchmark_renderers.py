@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from api.management.benchmarking import best_time, generate_books
+from api.models import Author, Book
+from api.renderers import FastJSONRenderer
+from api.serializers import AuthorSerializer, BookSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JSONRenderer and FastJSONRenderer on serialized book/author "
+        "payloads built from generated rows; everything is rolled back afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Books to generate")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per case; best is kept")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            generate_books(options["rows"])
+            payloads = [
+                ("BookSerializer", BookSerializer(Book.objects.all(), many=True).data),
+                ("AuthorSerializer", AuthorSerializer(Author.objects.with_books(), many=True).data),
+            ]
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'payload':<20}{'rows':>8}{'renderer':>20}{'MB/s':>10}{'rows/s':>14}{'speedup':>9}"
+        )
+        for name, data in payloads:
+            baseline = None
+            for renderer in (JSONRenderer(), FastJSONRenderer()):
+                size = len(renderer.render(data))
+                elapsed = best_time(options["repeat"], lambda: renderer.render(data))
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{name:<20}{len(data):>8}{type(renderer).__name__:>20}"
+                    f"{size / elapsed / 1e6:>10.1f}{len(data) / elapsed:>14,.0f}"
+                    f"{baseline / elapsed:>8.1f}x"
+                )
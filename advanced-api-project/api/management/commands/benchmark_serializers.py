@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from api.fastread import get_read_plan
+from api.management.benchmarking import best_time, generate_books
+from api.models import Author, Book
+from api.serializers import (
+    AuthorSerializer,
+    AuthorSimpleSerializer,
+    BookDetailSerializer,
+    BookSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF serializers with their read plans (api.fastread) on "
+        "generated rows; everything is rolled back afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Books to generate")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per case; best is kept")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            generate_books(options["rows"])
+            cases = [
+                (BookSerializer, Book.objects.all()),
+                (BookDetailSerializer, Book.objects.select_related("author")),
+                (AuthorSerializer, Author.objects.with_books()),
+                (AuthorSimpleSerializer, Author.objects.with_book_counts()),
+            ]
+            self.stdout.write(f"{'serializer':<24}{'rows':>8}{'drf rows/s':>14}{'plan rows/s':>14}{'speedup':>9}")
+            for serializer_class, queryset in cases:
+                plan = get_read_plan(serializer_class)
+                rows = queryset.count()
+                drf = best_time(options["repeat"], lambda: serializer_class(queryset.all(), many=True).data)
+                fast = best_time(options["repeat"], lambda: plan.represent(plan.values(queryset.all())))
+                self.stdout.write(
+                    f"{serializer_class.__name__:<24}{rows:>8}"
+                    f"{rows / drf:>14,.0f}{rows / fast:>14,.0f}{drf / fast:>8.1f}x"
+                )
+            transaction.set_rollback(True)
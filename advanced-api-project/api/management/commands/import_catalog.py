@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.exchange import EXPORT_FIELDS, FORMATS, IMPORT_BATCH_SIZE, import_stream
+
+
+class Command(BaseCommand):
+    help = "Load books or authors from a CSV or NDJSON file in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORT_FIELDS))
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per INSERT"
+        )
+
+    def handle(self, *args, **options):
+        with open(options["path"], encoding="utf-8", newline="") as lines:
+            try:
+                report = import_stream(
+                    options["kind"], options["format"], lines, options["batch_size"]
+                )
+            except UnicodeDecodeError as exc:
+                raise CommandError(
+                    f"{options['path']} is not valid UTF-8 ({exc.reason}); "
+                    "rows before the error may have been imported."
+                )
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report['created']}, existing {report['existing']}, "
+                f"new authors {report['authors_created']}, errors {report['error_count']}."
+            )
+        )
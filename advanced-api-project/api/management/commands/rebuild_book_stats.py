@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from api.models import BookStat
+
+
+class Command(BaseCommand):
+    help = "Recompute the BookStat rollup behind /api/stats/ with one GROUP BY over Book"
+
+    def handle(self, *args, **options):
+        rows = BookStat.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} author/year rows"))
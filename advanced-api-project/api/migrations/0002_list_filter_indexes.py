@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="author",
+            index=models.Index(fields=["name"], name="api_author_name_076641_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["-publication_year", "title"],
+                name="api_book_publica_b61f77_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["author", "-publication_year", "title"],
+                name="api_book_author__7cb5f4_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_book_stats(apps, schema_editor):
+    Book = apps.get_model("api", "Book")
+    BookStat = apps.get_model("api", "BookStat")
+    counts = (
+        Book.objects.order_by()
+        .values("author_id", "publication_year")
+        .annotate(book_count=models.Count("pk"))
+    )
+    BookStat.objects.bulk_create((BookStat(**row) for row in counts), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0002_list_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("publication_year", models.IntegerField()),
+                ("book_count", models.IntegerField(default=0)),
+                (
+                    "author",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="book_stats",
+                        to="api.author",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("author", "publication_year")},
+            },
+        ),
+        migrations.RunPython(fill_book_stats, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,25 @@
-from django.db import models
+from collections import Counter
+
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import bump_cache_version
+from .validators import existing_unique_keys
 
 # Create your models here.
 
 
+class AuthorQuerySet(models.QuerySet):
+    def with_book_counts(self):
+        """Annotate ``book_count`` with a single GROUP BY."""
+        return self.annotate(book_count=models.Count("books"))
+
+    def with_books(self):
+        """Book counts plus the books themselves in one extra query."""
+        return self.with_book_counts().prefetch_related("books")
+
+
 # Author model - represents authors who can write multiple books
 class Author(models.Model):
     """
@@ -17,11 +34,15 @@ class Author(models.Model):
 
     name = models.CharField(max_length=100, help_text="Author's full name")
 
+    objects = AuthorQuerySet.as_manager()
+
     def __str__(self):
         return self.name
 
     class Meta:
         ordering = ["name"]
+        # Default ordering on the author endpoints
+        indexes = [models.Index(fields=["name"])]
 
 
 # Book model with foreign key relationship to Author
@@ -51,7 +72,186 @@ class Book(models.Model):
     def __str__(self):
         return f"{self.title} ({self.publication_year})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        book = super().from_db(db, field_names, values)
+        # The (author, year) this row is counted under in BookStat; read from
+        # __dict__ so deferred fields are not fetched
+        if "author_id" in book.__dict__ and "publication_year" in book.__dict__:
+            book._stat_key = (book.author_id, book.publication_year)
+        return book
+
     class Meta:
         ordering = ["-publication_year", "title"]
         # Ensure no duplicate books by same author with same title and year
+        # (its index also serves title filters and ?ordering=title)
         unique_together = ["title", "author", "publication_year"]
+        indexes = [
+            # Default ordering plus publication_year exact/range filters
+            models.Index(fields=["-publication_year", "title"]),
+            # ?author=<id> lists and prefetch_related("books"), already in order
+            models.Index(fields=["author", "-publication_year", "title"]),
+        ]
+
+
+class BookStatQuerySet(models.QuerySet):
+    def record_books(self, books):
+        """
+        Count ``books`` under their current author and year.
+
+        Each book is moved from the key it was last counted under (its
+        ``_stat_key``; absent for books that were never counted) to its
+        current one. Used by the Book signals and by bulk writes that bypass
+        them.
+        """
+        deltas = Counter()
+        for book in books:
+            old = getattr(book, "_stat_key", None)
+            new = (book.author_id, book.publication_year)
+            if old != new:
+                if old is not None:
+                    deltas[old] -= 1
+                deltas[new] += 1
+                book._stat_key = new
+        self.apply_deltas(deltas)
+
+    def apply_deltas(self, deltas):
+        """Add ``{(author_id, publication_year): change}`` to the stored counts."""
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        if len(deltas) == 1:
+            # A single save or delete: usually one UPDATE
+            self.apply_delta(*deltas.popitem())
+            return
+        stored = existing_unique_keys(
+            self.all(),
+            ("author_id", "publication_year"),
+            [{"author_id": author_id, "publication_year": year} for author_id, year in deltas],
+        )
+        if stored:
+            self.filter(pk__in=stored.values()).update(
+                book_count=models.F("book_count")
+                + models.Case(
+                    *(models.When(pk=pk, then=deltas[key]) for key, pk in stored.items()),
+                    default=0,
+                )
+            )
+            self.filter(pk__in=stored.values(), book_count__lte=0).delete()
+        missing = {
+            key: delta for key, delta in deltas.items() if key not in stored and delta > 0
+        }
+        if not missing:
+            return
+        try:
+            with transaction.atomic():
+                self.bulk_create(
+                    self.model(author_id=author_id, publication_year=year, book_count=delta)
+                    for (author_id, year), delta in missing.items()
+                )
+        except IntegrityError:  # some inserted concurrently
+            for key, delta in missing.items():
+                self.apply_delta(key, delta)
+
+    def apply_delta(self, key, delta):
+        author_id, year = key
+        rows = self.filter(author_id=author_id, publication_year=year)
+        if rows.update(book_count=models.F("book_count") + delta):
+            if delta < 0:
+                rows.filter(book_count__lte=0).delete()
+        elif delta > 0:
+            try:
+                with transaction.atomic():
+                    self.create(author_id=author_id, publication_year=year, book_count=delta)
+            except IntegrityError:  # inserted concurrently
+                rows.update(book_count=models.F("book_count") + delta)
+
+    def rebuild(self):
+        """Recompute every row from Book with one GROUP BY."""
+        counts = (
+            Book.objects.order_by()
+            .values("author_id", "publication_year")
+            .annotate(book_count=models.Count("pk"))
+        )
+        with transaction.atomic():
+            self.all().delete()
+            return len(
+                self.bulk_create(
+                    (self.model(**row) for row in counts.iterator()), batch_size=1000
+                )
+            )
+
+    def summary(self):
+        """Books per author, per decade and per year, from one read of the rollup."""
+        authors, decades, years = {}, Counter(), Counter()
+        rows = self.order_by("author__name", "author_id").values_list(
+            "author_id", "author__name", "publication_year", "book_count"
+        )
+        for author_id, name, year, count in rows:
+            entry = authors.setdefault(author_id, {"author": author_id, "name": name, "books": 0})
+            entry["books"] += count
+            decades[year // 10 * 10] += count
+            years[year] += count
+        return {
+            "total_books": sum(years.values()),
+            "books_per_author": list(authors.values()),
+            "books_per_decade": [
+                {"decade": decade, "books": count} for decade, count in sorted(decades.items())
+            ],
+            "publication_years": [
+                {"year": year, "books": count} for year, count in sorted(years.items())
+            ],
+        }
+
+
+class BookStat(models.Model):
+    """
+    Rollup of Book: how many books each author has per publication year.
+
+    Kept current by the Book signals below (and by bulk writes, which call
+    ``BookStat.objects.record_books()``); ``manage.py rebuild_book_stats``
+    recomputes it from scratch. The stats endpoint reads only this table.
+    """
+
+    author = models.ForeignKey(Author, related_name="book_stats", on_delete=models.CASCADE)
+    publication_year = models.IntegerField()
+    book_count = models.IntegerField(default=0)
+
+    objects = BookStatQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ["author", "publication_year"]
+
+    def __str__(self):
+        return f"{self.author_id}/{self.publication_year}: {self.book_count}"
+
+
+@receiver(pre_save, sender=Book)
+def remember_book_stat_key(sender, instance, raw, **kwargs):
+    # Books saved without being loaded first: look up what is stored
+    if not raw and instance.pk is not None and not hasattr(instance, "_stat_key"):
+        instance._stat_key = (
+            Book.objects.filter(pk=instance.pk)
+            .values_list("author_id", "publication_year")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Book)
+def count_saved_book(sender, instance, raw, **kwargs):
+    if not raw:
+        BookStat.objects.record_books([instance])
+
+
+@receiver(post_delete, sender=Book)
+def uncount_deleted_book(sender, instance, **kwargs):
+    key = getattr(instance, "_stat_key", None) or (instance.author_id, instance.publication_year)
+    BookStat.objects.apply_deltas({key: -1})
+
+
+# Cached list responses (api.caching) are versioned per model; bulk writes
+# that skip these signals call bump_cache_version() themselves
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_cache_version(sender)
@@ -1,6 +1,56 @@
+import uuid
+
 from rest_framework import serializers
-from datetime import datetime
-from .models import Author, Book
+from django.db import transaction
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat
+from .caching import bump_cache_version
+from .models import Author, Book, BookStat
+from .validators import (
+    BatchUniqueListSerializer,
+    existing_unique_keys,
+    validate_publication_year,
+)
+
+# Rows per INSERT/UPDATE/lookup in the bulk endpoints, and the most items a
+# single bulk request may carry
+BULK_BATCH_SIZE = 1000
+BULK_MAX_ITEMS = 10000
+
+
+def get_book_count(author):
+    """
+    Number of books by ``author`` without a per-row COUNT query when possible.
+
+    Prefers a ``book_count`` annotation (see ``Author.objects.with_book_counts``),
+    then the length of a ``prefetch_related("books")`` cache, and only falls
+    back to ``COUNT(*)`` for a bare instance.
+    """
+    book_count = getattr(author, "book_count", None)
+    if book_count is not None:
+        return book_count
+    if "books" in getattr(author, "_prefetched_objects_cache", {}):
+        return len(author.books.all())
+    return author.books.count()
+
+
+class BookListSerializer(BatchUniqueListSerializer):
+    """
+    ``BookSerializer(many=True)``: all-or-nothing creation of several books.
+
+    Validation is batched (see BatchUniqueListSerializer) and the rows are
+    written with one INSERT per BULK_BATCH_SIZE books.
+    """
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            books = Book.objects.bulk_create(
+                [Book(**attrs) for attrs in validated_data], batch_size=BULK_BATCH_SIZE
+            )
+            # bulk_create sends no post_save signals
+            BookStat.objects.record_books(books)
+        bump_cache_version(Book)
+        return books
 
 
 class BookSerializer(serializers.ModelSerializer):
@@ -20,6 +70,8 @@ class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["id", "title", "publication_year", "author"]
+        # many=True validates and inserts the whole list in batches
+        list_serializer_class = BookListSerializer
 
     def validate_publication_year(self, value):
         """
@@ -33,21 +85,9 @@ class BookSerializer(serializers.ModelSerializer):
 
         Raises:
             serializers.ValidationError: If publication_year is in the future
+            or not a 4-digit year (see api.validators)
         """
-        current_year = datetime.now().year
-
-        if value > current_year:
-            raise serializers.ValidationError(
-                f"Publication year cannot be in the future. Current year is {current_year}."
-            )
-
-        # For fun Added minimum year validation
-        if value < 1000:
-            raise serializers.ValidationError(
-                "Publication year must be a valid 4-digit year."
-            )
-
-        return value
+        return validate_publication_year(value)
 
 
 class AuthorSerializer(serializers.ModelSerializer):
@@ -68,6 +108,10 @@ class AuthorSerializer(serializers.ModelSerializer):
     # 'read_only=True' because we don't want to create/update books through author endpoint
     books = BookSerializer(many=True, read_only=True)
 
+    # Key added by to_representation(), for the list fast path (api.fastread);
+    # the annotation comes from Author.objects.with_book_counts()
+    read_columns = {"book_count": "book_count"}
+
     class Meta:
         model = Author
         fields = ["id", "name", "books"]
@@ -79,8 +123,9 @@ class AuthorSerializer(serializers.ModelSerializer):
         """
         representation = super().to_representation(instance)
 
-        # Add book count for convenience
-        representation["book_count"] = instance.books.count()
+        # Add book count for convenience; free when the queryset was prepared
+        # with Author.objects.with_books()
+        representation["book_count"] = get_book_count(instance)
 
         return representation
 
@@ -94,13 +139,16 @@ class AuthorSimpleSerializer(serializers.ModelSerializer):
 
     book_count = serializers.SerializerMethodField()
 
+    # get_book_count() as a column for the list fast path (api.fastread)
+    read_columns = {"book_count": "book_count"}
+
     class Meta:
         model = Author
         fields = ["id", "name", "book_count"]
 
     def get_book_count(self, obj):
         """Return the number of books by this author."""
-        return obj.books.count()
+        return get_book_count(obj)
 
 
 # Alternative: Detailed BookSerializer with author name (instead of just ID)
@@ -118,16 +166,245 @@ class BookDetailSerializer(serializers.ModelSerializer):
 
     def validate_publication_year(self, value):
         """Same validation as BookSerializer."""
-        current_year = datetime.now().year
+        return validate_publication_year(value)
+
 
-        if value > current_year:
+# Bulk endpoints: a list serializer that validates every item in one pass,
+# keeps going past invalid items and writes the rest in batches
+class BookBulkListSerializer(serializers.ListSerializer):
+    """
+    List serializer behind ``BookBulkView``.
+
+    Unlike the stock ListSerializer, invalid items do not fail the whole
+    request: ``to_internal_value()`` returns ``(index, attrs)`` pairs for the
+    valid items and records the rest in ``item_errors`` keyed by their index
+    in the payload. Author ids and unique_together keys are checked with one
+    query per batch instead of one per item.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
             raise serializers.ValidationError(
-                f"Publication year cannot be in the future. Current year is {current_year}."
+                {"non_field_errors": ["Expected a list of books."]}
             )
-
-        if value < 1000:
+        if not data:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["This list may not be empty."]}
+            )
+        if len(data) > BULK_MAX_ITEMS:
             raise serializers.ValidationError(
-                "Publication year must be a valid 4-digit year."
+                {"non_field_errors": [f"At most {BULK_MAX_ITEMS} books per request."]}
             )
 
-        return value
+        self.item_errors = {}
+        valid = []
+        for index, item in enumerate(data):
+            try:
+                valid.append((index, self.child.run_validation(item)))
+            except serializers.ValidationError as exc:
+                self.item_errors[index] = exc.detail
+
+        author_ids = {attrs["author_id"] for _, attrs in valid if "author_id" in attrs}
+        known = set()
+        for batch in _batches(list(author_ids)):
+            known.update(
+                Author.objects.filter(pk__in=batch).values_list("pk", flat=True)
+            )
+        checked = []
+        for index, attrs in valid:
+            if "author_id" in attrs and attrs["author_id"] not in known:
+                self.item_errors[index] = {
+                    "author": [f'Invalid pk "{attrs["author_id"]}" - object does not exist.']
+                }
+            else:
+                checked.append((index, attrs))
+        return checked
+
+    def create(self, validated_data):
+        """
+        Insert new books, treating items whose (title, author, publication_year)
+        already exists - in the database or earlier in the payload - as hits.
+
+        Returns:
+            list: ``{"index", "id", "status"}`` per item, status "created" or
+            "existing"
+        """
+        results = []
+        seen = {}  # key -> pk of a stored row, or the Book about to be inserted
+        with transaction.atomic():
+            for batch in _batches(validated_data):
+                existing = existing_book_keys(attrs for _, attrs in batch)
+                pending = []
+                for index, attrs in batch:
+                    key = book_key(attrs)
+                    if key not in seen:
+                        if key in existing:
+                            seen[key] = existing[key]
+                        else:
+                            seen[key] = Book(**attrs)
+                            pending.append(seen[key])
+                            results.append((index, key, "created"))
+                            continue
+                    results.append((index, key, "existing"))
+                Book.objects.bulk_create(pending)
+                BookStat.objects.record_books(pending)
+        bump_cache_version(Book)
+        return [
+            {
+                "index": index,
+                "id": seen[key].pk if isinstance(seen[key], Book) else seen[key],
+                "status": status,
+            }
+            for index, key, status in sorted(results)
+        ]
+
+    def bulk_update(self, validated_data):
+        """
+        Apply partial updates to existing books, batch by batch.
+
+        Every row's final (title, author, publication_year) key is worked out
+        before anything is written, so the outcome does not depend on the
+        order of the items. A row that keeps its key always succeeds. A
+        stored key is free once its holder moves off it in the same batch, so
+        swaps and chains go through. Every row moving onto a key that would
+        end up held twice is rejected.
+
+        Returns:
+            list: ``{"index", "id", "status": "updated"}`` per applied item;
+            missing ids and unique_together collisions go to ``item_errors``
+        """
+        results = []
+        with transaction.atomic():
+            for batch in _batches(validated_data):
+                books = Book.objects.in_bulk([attrs["id"] for _, attrs in batch])
+                changed, old_keys, fields = {}, {}, set()
+                for index, attrs in batch:
+                    book = books.get(attrs["id"])
+                    if book is None:
+                        self.item_errors[index] = {"id": ["Book not found."]}
+                        continue
+                    old_keys.setdefault(book.pk, book_key(_book_key_attrs(book)))
+                    for field, value in attrs.items():
+                        if field != "id":
+                            setattr(book, field, value)
+                            fields.add(field)
+                    changed[index] = book
+
+                new_keys = {
+                    index: book_key(_book_key_attrs(book)) for index, book in changed.items()
+                }
+                moving = {
+                    index for index, book in changed.items()
+                    if new_keys[index] != old_keys[book.pk]
+                }
+                for index in _clashing_moves(changed, old_keys, new_keys, moving):
+                    self.item_errors[index] = {
+                        "non_field_errors": [
+                            "A book with this title, author and publication year already exists."
+                        ]
+                    }
+                    moving.discard(index)
+                    del changed[index]
+
+                rows = list({book.pk: book for book in changed.values()}.values())
+                if rows and fields:
+                    # Unique constraints are checked row by row inside one
+                    # UPDATE, so rows handing their key to another row step
+                    # aside onto a placeholder title first
+                    claimed = {new_keys[index] for index in moving}
+                    handing_over = [
+                        changed[index].pk
+                        for index in moving
+                        if old_keys[changed[index].pk] in claimed
+                    ]
+                    if handing_over:
+                        Book.objects.filter(pk__in=handing_over).update(
+                            title=Concat(
+                                Value(f"~{uuid.uuid4().hex}:"), Cast("pk", CharField())
+                            )
+                        )
+                        fields.add("title")
+                    Book.objects.bulk_update(rows, sorted(fields))
+                    BookStat.objects.record_books(rows)
+                results.extend(
+                    {"index": index, "id": book.pk, "status": "updated"}
+                    for index, book in changed.items()
+                )
+        bump_cache_version(Book)
+        return results
+
+
+def _clashing_moves(changed, old_keys, new_keys, moving):
+    """
+    Indexes in ``moving`` whose new key would not be unique after the write.
+
+    Rejected rows keep their old key, which can in turn clash with another
+    move, so this repeats until the remaining moves are consistent.
+    """
+    batch_pks = {book.pk for book in changed.values()}
+    # Stored rows outside the batch keep their keys
+    fixed = {
+        key: {pk}
+        for key, pk in existing_book_keys(
+            _book_key_attrs(book) for book in changed.values()
+        ).items()
+        if pk not in batch_pks
+    }
+    accepted = set(moving)
+    while True:
+        holders = {key: set(pks) for key, pks in fixed.items()}
+        for index, book in changed.items():
+            key = new_keys[index] if index in accepted else old_keys[book.pk]
+            holders.setdefault(key, set()).add(book.pk)
+        clashing = {index for index in accepted if len(holders[new_keys[index]]) > 1}
+        if not clashing:
+            return sorted(moving - accepted)
+        accepted -= clashing
+
+
+class BookBulkSerializer(BookSerializer):
+    """
+    One item of a bulk create/update payload.
+
+    Validates fields only: author existence and unique_together are checked
+    per batch by BookBulkListSerializer, so this serializer never queries.
+    """
+
+    id = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(source="author_id", min_value=1)
+
+    class Meta(BookSerializer.Meta):
+        list_serializer_class = BookBulkListSerializer
+        # Replaced by the per-batch key lookup (and upsert) in the list serializer
+        validators = []
+
+    def validate(self, attrs):
+        if self.root.partial and "id" not in attrs:
+            raise serializers.ValidationError({"id": ["This field is required."]})
+        if not self.root.partial:
+            attrs.pop("id", None)
+        return attrs
+
+
+def _batches(items, size=BULK_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def book_key(attrs):
+    return attrs["title"], attrs["author_id"], attrs["publication_year"]
+
+
+def _book_key_attrs(book):
+    return {
+        "title": book.title,
+        "author_id": book.author_id,
+        "publication_year": book.publication_year,
+    }
+
+
+def existing_book_keys(attrs_list):
+    """Map (title, author_id, publication_year) -> pk for keys already stored."""
+    return existing_unique_keys(
+        Book.objects.all(), ("title", "author_id", "publication_year"), attrs_list
+    )
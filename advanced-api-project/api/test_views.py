@@ -1,9 +1,35 @@
 # Test file
 
+import json
+import os
+import tempfile
+import uuid
+from datetime import date, datetime, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.urls import reverse
-from rest_framework import status
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase, APIClient
-from api.models import Book, Author
+from api.models import Book, Author, BookStat
+from api.exchange import IMPORT_BATCH_SIZE
+from api.fastread import get_read_plan
+from api.pagination import BoundedPageNumberPagination
+from api.renderers import FastJSONRenderer
+from api.serializers import (
+    AuthorSerializer,
+    AuthorSimpleSerializer,
+    BookDetailSerializer,
+    BookSerializer,
+    get_book_count,
+)
+from api.validators import current_year
+from api.views import BookStreamView
 from django.contrib.auth.models import User
 
 
@@ -108,3 +134,566 @@ class BookAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
 
         self.client.login
+
+
+class AuthorQueryCountTests(APITestCase):
+    def setUp(self):
+        for i in range(5):
+            author = Author.objects.create(name=f"Author {i}")
+            for year in (2001, 2002, 2003):
+                Book.objects.create(
+                    title=f"Book {i}", author=author, publication_year=year
+                )
+
+    def test_author_list_queries_do_not_grow_with_authors(self):
+        with self.assertNumQueries(3):  # page count, authors + counts, then books
+            response = self.client.get(reverse("author-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        authors = response.data["results"]
+        self.assertEqual(len(authors), 5)
+        self.assertEqual(authors[0]["book_count"], 3)
+        self.assertEqual(len(authors[0]["books"]), 3)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("author-summary"))
+        self.assertEqual([a["book_count"] for a in response.data["results"]], [3] * 5)
+
+    def test_book_count_falls_back_to_prefetch_cache(self):
+        author = Author.objects.prefetch_related("books").first()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_book_count(author), 3)
+
+
+class BookFilterTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        tolkien = Author.objects.create(name="J.R.R. Tolkien")
+        austen = Author.objects.create(name="Jane Austen")
+        Book.objects.create(title="The Hobbit", author=tolkien, publication_year=1937)
+        Book.objects.create(title="Silmarillion", author=tolkien, publication_year=1977)
+        Book.objects.create(title="Emma", author=austen, publication_year=1815)
+
+    def titles(self, query):
+        response = self.client.get(reverse("book-list") + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [book["title"] for book in response.data["results"]]
+
+    def test_publication_year_range(self):
+        self.assertEqual(
+            self.titles("?publication_year__gte=1900&publication_year__lte=1950"),
+            ["The Hobbit"],
+        )
+        self.assertEqual(self.titles("?publication_year__lte=1950"), ["Emma", "The Hobbit"])
+
+    def test_search_matches_author_names(self):
+        self.assertEqual(self.titles("?search=jane"), ["Emma"])
+        self.assertEqual(self.titles("?search=austen"), ["Emma"])
+        self.assertEqual(self.titles("?search=Silm"), ["Silmarillion"])
+
+    def test_author_search_and_ordering(self):
+        response = self.client.get(reverse("author-summary") + "?ordering=-book_count")
+        names = [a["name"] for a in response.data["results"]]
+        self.assertEqual(names, ["J.R.R. Tolkien", "Jane Austen"])
+        response = self.client.get(reverse("author-summary") + "?search=aust")
+        self.assertEqual([a["name"] for a in response.data["results"]], ["Jane Austen"])
+
+
+class BookBulkTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="pass")
+        self.client.force_authenticate(user=self.user)
+        self.author = Author.objects.create(name="Ursula K. Le Guin")
+        self.existing = Book.objects.create(
+            title="The Dispossessed", author=self.author, publication_year=1974
+        )
+        self.url = reverse("book-bulk")
+
+    def test_create_upserts_and_reports_item_errors(self):
+        payload = [
+            {"title": "A Wizard of Earthsea", "publication_year": 1968, "author": self.author.pk},
+            {"title": "The Dispossessed", "publication_year": 1974, "author": self.author.pk},
+            {"title": "Future Book", "publication_year": 3000, "author": self.author.pk},
+            {"title": "Orphan", "publication_year": 1970, "author": 999},
+            {"title": "A Wizard of Earthsea", "publication_year": 1968, "author": self.author.pk},
+        ]
+        # savepoint x2, authors, keys, insert, then the BookStat rollup
+        # (update, savepoint x2, insert)
+        with self.assertNumQueries(9):
+            response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(sorted(response.data["errors"]), ["2", "3"])
+        self.assertIn("publication_year", response.data["errors"]["2"])
+        self.assertIn("author", response.data["errors"]["3"])
+
+        results = {r["index"]: r for r in response.data["results"]}
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(results[1], {"index": 1, "id": self.existing.pk, "status": "existing"})
+        self.assertEqual(results[4]["id"], results[0]["id"])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_bulk_update_and_delete(self):
+        other = Book.objects.create(title="Lathe", author=self.author, publication_year=1971)
+        Book.objects.create(title="Always Coming Home", author=self.author, publication_year=1985)
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": other.pk, "title": "The Lathe of Heaven"},
+                {"id": self.existing.pk, "title": "Always Coming Home", "publication_year": 1985},
+                {"id": 999, "title": "Missing"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(sorted(response.data["errors"]), ["1", "2"])
+        other.refresh_from_db()
+        self.assertEqual(other.title, "The Lathe of Heaven")
+
+        response = self.client.delete(
+            self.url, {"ids": [other.pk, self.existing.pk, 999]}, format="json"
+        )
+        self.assertEqual(response.data, {"deleted": 2, "missing": [999]})
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_bulk_update_conflicts_do_not_depend_on_item_order(self):
+        moved = Book.objects.create(title="Lathe", author=self.author, publication_year=1991)
+        keeper = Book.objects.create(title="TB", author=self.author, publication_year=1991)
+        items = [
+            {"id": moved.pk, "title": "TB", "publication_year": 1991},
+            {"id": keeper.pk, "title": "TB"},
+        ]
+        for payload in (items, items[::-1]):
+            response = self.client.patch(self.url, payload, format="json")
+            self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+            rejected = str(payload.index(items[0]))
+            self.assertEqual(list(response.data["errors"]), [rejected])
+            self.assertEqual([r["id"] for r in response.data["results"]], [keeper.pk])
+        moved.refresh_from_db()
+        self.assertEqual(moved.title, "Lathe")
+
+    def test_bulk_update_swaps_keys(self):
+        other = Book.objects.create(title="Lathe", author=self.author, publication_year=1971)
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": other.pk, "title": "The Dispossessed", "publication_year": 1974},
+                {"id": self.existing.pk, "title": "Lathe", "publication_year": 1971},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        other.refresh_from_db()
+        self.existing.refresh_from_db()
+        self.assertEqual((other.title, other.publication_year), ("The Dispossessed", 1974))
+        self.assertEqual((self.existing.title, self.existing.publication_year), ("Lathe", 1971))
+
+        # Two rows moving onto one free key are both rejected
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": other.pk, "title": "Free"},
+                {"id": self.existing.pk, "title": "Free", "publication_year": 1974},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Book.objects.filter(title="Free").exists())
+
+    def test_bulk_delete_query_count_does_not_grow_with_the_batch(self):
+        other = Author.objects.create(name="Octavia E. Butler")
+        Book.objects.bulk_create(
+            Book(title=f"Book {i}", author=(self.author, other)[i % 2], publication_year=1980 + i % 3)
+            for i in range(200)
+        )
+        BookStat.objects.rebuild()
+        ids = list(Book.objects.exclude(pk=self.existing.pk).values_list("pk", flat=True))
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            # Transaction, ids and keys, DELETE, then the rollup: stored keys,
+            # one UPDATE and the cleanup of emptied rows
+            with self.assertNumQueries(7):
+                response = self.client.delete(self.url, {"ids": ids + [0]}, format="json")
+        self.assertEqual(response.data, {"deleted": 200, "missing": [0]})
+        self.assertEqual(len(callbacks), 1)  # one cache version bump
+        self.assertEqual(
+            list(BookStat.objects.values_list("author", "publication_year", "book_count")),
+            [(self.author.pk, 1974, 1)],
+        )
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        response = self.client.post(self.url, [], format="json")
+        self.assertIn(response.status_code, (401, 403))
+
+
+class CatalogExchangeTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sync", password="pass")
+        author = Author.objects.create(name="Octavia E. Butler")
+        Book.objects.create(title="Kindred", author=author, publication_year=1979)
+
+    def read(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_streams_csv_and_ndjson(self):
+        response = self.client.get(reverse("catalog-export", args=["books", "csv"]))
+        self.assertTrue(response.streaming)
+        lines = self.read(response).splitlines()
+        self.assertEqual(lines[0], "id,title,publication_year,author_id,author_name")
+        self.assertIn("Kindred,1979", lines[1])
+
+        response = self.client.get(reverse("catalog-export", args=["authors", "ndjson"]))
+        self.assertEqual(json.loads(self.read(response))["name"], "Octavia E. Butler")
+
+        response = self.client.get(reverse("catalog-export", args=["users", "csv"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_import_batches_and_resolves_author_names(self):
+        body = "\n".join(
+            [
+                json.dumps({"title": "Parable of the Sower", "publication_year": 1993, "author_name": "Octavia E. Butler"}),
+                json.dumps({"title": "Kindred", "publication_year": 1979, "author_name": "Octavia E. Butler"}),
+                json.dumps({"title": "Dawn", "publication_year": 1987, "author_name": "New Author"}),
+                json.dumps({"title": "Bad", "publication_year": "soon", "author_name": "X"}),
+                "not json",
+            ]
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.generic(
+            "POST",
+            reverse("catalog-import", args=["books", "ndjson"]),
+            body,
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["existing"], 1)
+        self.assertEqual(response.data["authors_created"], 1)
+        self.assertEqual([e["line"] for e in response.data["errors"]], [4, 5])
+        self.assertTrue(Book.objects.filter(title="Dawn", author__name="New Author").exists())
+
+    def post_import(self, kind, body):
+        self.client.force_authenticate(user=self.user)
+        return self.client.generic(
+            "POST",
+            reverse("catalog-import", args=[kind, "ndjson"]),
+            body,
+            content_type="application/x-ndjson",
+        )
+
+    def test_import_rejects_wrongly_typed_values(self):
+        author = Author.objects.get()
+        records = [
+            {"title": 5, "publication_year": 2001, "author_name": "X"},
+            {"title": "A", "publication_year": 2001.7, "author_name": "X"},
+            {"title": "B", "publication_year": True, "author_name": "X"},
+            {"title": "C", "publication_year": 2001, "author_name": []},
+            {"title": "D", "publication_year": 2001, "author_id": 1.0},
+            {"title": "E", "publication_year": " 2001 ", "author_id": str(author.pk)},
+        ]
+        response = self.post_import("books", "\n".join(json.dumps(r) for r in records))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {"line": 1, "error": "title must be a string."},
+                {"line": 2, "error": "publication_year must be an integer."},
+                {"line": 3, "error": "publication_year must be an integer."},
+                {"line": 4, "error": "author_name must be a string."},
+                {"line": 5, "error": "author_name or author_id is required."},
+            ],
+        )
+        self.assertEqual(response.data["created"], 1)
+
+        response = self.post_import("authors", json.dumps({"name": []}))
+        self.assertEqual(response.data["errors"], [{"line": 1, "error": "name must be a string."}])
+
+    def test_undecodable_body_is_rejected_after_invalidating_committed_batches(self):
+        lines = [
+            json.dumps({"title": f"Book {i}", "publication_year": 2000, "author_name": "X"})
+            for i in range(IMPORT_BATCH_SIZE)
+        ]
+        body = ("\n".join(lines) + "\n").encode() + b"\xff\n"
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.post_import("books", body)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # The first batch was written before the bad line, and the cache still bumped
+        self.assertEqual(Book.objects.count(), IMPORT_BATCH_SIZE + 1)
+        self.assertEqual(len(callbacks), 1)
+
+    def test_commands_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "books.csv")
+            call_command("export_catalog", "books", "--output", path)
+            Book.objects.all().delete()
+            out = StringIO()
+            call_command("import_catalog", "books", path, "--batch-size", "1", stdout=out)
+        self.assertIn("Created 1", out.getvalue())
+        self.assertTrue(Book.objects.filter(title="Kindred").exists())
+
+
+class BookListCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(name="N. K. Jemisin")
+        Book.objects.create(title="The Fifth Season", author=self.author, publication_year=2015)
+
+    def test_hits_skip_queries_and_writes_invalidate(self):
+        url = reverse("book-list") + "?ordering=title"
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual(cached["Content-Type"], first["Content-Type"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.create(title="The Obelisk Gate", author=self.author, publication_year=2016)
+        response = self.client.get(url)
+        self.assertEqual(response.data["count"], 2)
+
+    def test_key_normalizes_params_and_separates_scopes(self):
+        self.client.get(reverse("book-list") + "?ordering=title&search=fifth")
+        with self.assertNumQueries(0):
+            self.client.get(reverse("book-list") + "?search=fifth&ordering=title")
+
+        user = User.objects.create_user(username="reader", password="pass")
+        self.client.force_authenticate(user=user)
+        with self.assertNumQueries(2):  # page count, page
+            self.client.get(reverse("book-list") + "?search=fifth&ordering=title")
+
+
+class BookPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        author = Author.objects.create(name="Terry Pratchett")
+        Book.objects.bulk_create(
+            Book(title=f"Discworld {i:02}", author=author, publication_year=1983 + i // 2)
+            for i in range(41)
+        )
+
+    def test_lists_are_paged_and_page_size_is_capped(self):
+        response = self.client.get(reverse("book-list"))
+        self.assertEqual(response.data["count"], 41)
+        self.assertEqual(len(response.data["results"]), 41)
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(reverse("book-list") + "?page_size=10&page=5")
+        self.assertEqual([b["title"] for b in response.data["results"]], ["Discworld 40"])
+
+        with patch.object(BoundedPageNumberPagination, "max_page_size", 20):
+            response = self.client.get(reverse("book-list") + "?page_size=10000")
+        self.assertEqual(len(response.data["results"]), 20)
+
+    def test_stream_returns_every_filtered_row_as_one_array(self):
+        with patch.object(BookStreamView, "stream_chunk_size", 7):
+            response = self.client.get(
+                reverse("book-stream") + "?publication_year__gte=1990&ordering=-title"
+            )
+        self.assertTrue(response.streaming)
+        books = json.loads(b"".join(response.streaming_content))
+        expected = Book.objects.filter(publication_year__gte=1990).order_by("-title")
+        self.assertEqual(books, BookSerializer(expected, many=True).data)
+
+        response = self.client.get(reverse("book-stream") + "?search=nothing")
+        self.assertEqual(b"".join(response.streaming_content), b"[]")
+
+
+class ReadPlanTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        le_guin = Author.objects.create(name="Ursula K. Le Guin")
+        Author.objects.create(name="Nobody Yet")
+        for year, title in ((1969, "The Left Hand of Darkness"), (1974, "The Dispossessed")):
+            Book.objects.create(title=title, author=le_guin, publication_year=year)
+
+    def assert_same_output(self, serializer_class, queryset):
+        plan = get_read_plan(serializer_class)
+        self.assertIsNotNone(plan)
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        self.assertEqual(JSONRenderer().render(plan.represent(plan.values(queryset))), expected)
+
+    def test_plans_match_drf_output_byte_for_byte(self):
+        self.assert_same_output(BookSerializer, Book.objects.all())
+        self.assert_same_output(BookDetailSerializer, Book.objects.select_related("author"))
+        self.assert_same_output(AuthorSerializer, Author.objects.with_books())
+        self.assert_same_output(AuthorSimpleSerializer, Author.objects.with_book_counts())
+
+    def test_unsupported_serializers_fall_back(self):
+        class Custom(BookSerializer):
+            extra = serializers.SerializerMethodField()
+
+            class Meta(BookSerializer.Meta):
+                fields = BookSerializer.Meta.fields + ["extra"]
+
+            def get_extra(self, obj):
+                return 1
+
+        self.assertIsNone(get_read_plan(Custom))
+
+    def test_list_endpoints_use_the_plan(self):
+        response = self.client.get(reverse("author-list"))
+        expected = AuthorSerializer(Author.objects.with_books().order_by("name"), many=True).data
+        self.assertEqual(response.data["results"], expected)
+        books = json.loads(b"".join(self.client.get(reverse("book-stream")).streaming_content))
+        self.assertEqual(books, BookSerializer(Book.objects.order_by("title"), many=True).data)
+
+
+class FastJSONRendererTests(APITestCase):
+    def test_output_matches_json_renderer(self):
+        data = {
+            "title": "Café   naïve",
+            "price": Decimal("12.50"),
+            "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+            "published": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            "day": date(2024, 5, 1),
+            "label": gettext_lazy("Books"),
+            "counts": {1: 2},
+            "nested": [{"a": None, "b": True, "c": 1.5}],
+        }
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render(2**70), JSONRenderer().render(2**70))
+        indented = FastJSONRenderer().render(data, "application/json; indent=2")
+        self.assertEqual(indented, JSONRenderer().render(data, "application/json; indent=2"))
+
+    def test_stream_renders_one_array(self):
+        renderer = FastJSONRenderer()
+        chunks = [[{"id": 1}], [], [{"id": 2}, {"id": 3}]]
+        self.assertEqual(b"".join(renderer.stream(chunks)), b'[{"id":1},{"id":2},{"id":3}]')
+        self.assertEqual(b"".join(renderer.stream([])), b"[]")
+
+    def test_is_the_default_renderer(self):
+        response = self.client.get(reverse("book-list"))
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+
+
+class BatchValidationTests(APITestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="Italo Calvino")
+        Book.objects.create(title="Invisible Cities", author=self.author, publication_year=1972)
+
+    def test_unique_together_checked_once_for_the_payload(self):
+        def item(title, year=1979):
+            return {"title": title, "author": self.author.pk, "publication_year": year}
+
+        payload = [
+            item("If on a winter's night a traveler"),
+            item("Invisible Cities", 1972),
+            item("Mr Palomar", 1983),
+            item("Mr Palomar", 1983),
+            item("Cosmicomics", 3000),
+        ]
+        serializer = BookSerializer(data=payload, many=True)
+        # One author lookup and one unique_together lookup for the whole payload
+        with self.assertNumQueries(2):
+            self.assertFalse(serializer.is_valid())
+        errors = serializer.errors
+        if isinstance(errors, dict):
+            errors = [errors.get(i, {}) for i in range(len(payload))]
+        self.assertEqual(errors[0], {})
+        self.assertIn("non_field_errors", errors[1])
+        self.assertEqual(errors[2], {})
+        self.assertIn("non_field_errors", errors[3])
+        self.assertIn("publication_year", errors[4])
+
+        serializer = BookSerializer(data=payload[:1] + payload[2:3], many=True)
+        self.assertTrue(serializer.is_valid())
+        self.assertEqual(len(serializer.save()), 2)
+
+    def test_query_count_does_not_grow_with_the_payload(self):
+        other = Author.objects.create(name="Primo Levi")
+        payload = [
+            {"title": f"Book {i}", "author": (self.author, other)[i % 2].pk, "publication_year": 1980}
+            for i in range(50)
+        ]
+        payload.append({"title": "Nobody's", "author": 999, "publication_year": 1980})
+        serializer = BookSerializer(data=payload, many=True)
+        with self.assertNumQueries(2):
+            self.assertFalse(serializer.is_valid())
+        errors = serializer.errors
+        if isinstance(errors, dict):
+            errors = [errors.get(i, {}) for i in range(len(payload))]
+        self.assertEqual(errors[:50], [{}] * 50)
+        self.assertIn("author", errors[50])
+
+    def test_create_view_takes_a_list(self):
+        user = User.objects.create_user(username="cataloguer", password="pass")
+        self.client.force_authenticate(user=user)
+        url = reverse("book-create")
+        payload = [
+            {"title": "Mr Palomar", "author": self.author.pk, "publication_year": 1983},
+            {"title": "Invisible Cities", "author": self.author.pk, "publication_year": 1972},
+        ]
+        response = self.client.post(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Book.objects.count(), 1)
+
+        response = self.client.post(url, payload[:1], format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([book["title"] for book in response.data], ["Mr Palomar"])
+        # bulk_create bypasses the signals; the rollup is still kept in step
+        self.assertEqual(BookStat.objects.summary()["total_books"], 2)
+
+    def test_single_item_validation_is_unchanged(self):
+        serializer = BookSerializer(
+            data={"title": "Invisible Cities", "author": self.author.pk, "publication_year": 1972}
+        )
+        self.assertFalse(serializer.is_valid())
+        self.assertIn("non_field_errors", serializer.errors)
+        self.assertEqual(current_year(), datetime.now().year)
+
+
+class BookStatsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="stats", password="pass")
+        self.lem = Author.objects.create(name="Stanislaw Lem")
+        self.dick = Author.objects.create(name="Philip K. Dick")
+        Book.objects.create(title="Solaris", author=self.lem, publication_year=1961)
+        Book.objects.create(title="His Master's Voice", author=self.lem, publication_year=1968)
+        Book.objects.create(title="Ubik", author=self.dick, publication_year=1969)
+
+    def assert_rollup_matches_books(self):
+        live = sorted(BookStat.objects.values_list("author_id", "publication_year", "book_count"))
+        BookStat.objects.rebuild()
+        rebuilt = sorted(BookStat.objects.values_list("author_id", "publication_year", "book_count"))
+        self.assertEqual(live, rebuilt)
+
+    def test_rollup_follows_saves_deletes_and_bulk_writes(self):
+        ubik = Book.objects.get(title="Ubik")
+        ubik.publication_year = 1961
+        ubik.save()
+        Book.objects.filter(title="Solaris").delete()
+        self.client.force_authenticate(user=self.user)
+        self.client.post(
+            reverse("book-bulk"),
+            [
+                {"title": "The Cyberiad", "author": self.lem.pk, "publication_year": 1965},
+                {"title": "Ubik", "author": self.dick.pk, "publication_year": 1961},
+                {"title": "Fiasco", "author": self.lem.pk, "publication_year": 1968},
+                {"title": "Eden", "author": self.lem.pk, "publication_year": 1959},
+            ],
+            format="json",
+        )
+        book = Book.objects.get(title="The Cyberiad")
+        self.client.patch(
+            reverse("book-bulk"), [{"id": book.pk, "publication_year": 1967}], format="json"
+        )
+        self.assert_rollup_matches_books()
+
+    def test_stats_endpoint_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("stats"))
+        self.assertEqual(response.data["total_books"], 3)
+        self.assertEqual(
+            response.data["books_per_author"],
+            [
+                {"author": self.dick.pk, "name": "Philip K. Dick", "books": 1},
+                {"author": self.lem.pk, "name": "Stanislaw Lem", "books": 2},
+            ],
+        )
+        self.assertEqual(response.data["books_per_decade"], [{"decade": 1960, "books": 3}])
+        self.assertEqual([y["year"] for y in response.data["publication_years"]], [1961, 1968, 1969])
+
+    def test_rebuild_command(self):
+        BookStat.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_book_stats", stdout=out)
+        self.assertIn("Rebuilt 3", out.getvalue())
+        self.assertEqual(self.client.get(reverse("stats")).data["total_books"], 3)
@@ -1,16 +1,32 @@
 from django.urls import path
 from .views import (
+    AuthorDetailView,
+    AuthorListView,
+    AuthorSummaryListView,
     BookListView,
+    BookStreamView,
     BookDetailView,
     BookCreateView,
     BookUpdateView,
     BookDeleteView,
+    BookBulkView,
+    CatalogExportView,
+    CatalogImportView,
+    StatsView,
 )
 
 urlpatterns = [
     path("books/", BookListView.as_view(), name="book-list"),  # GET all
+    path("books/stream/", BookStreamView.as_view(), name="book-stream"),  # GET all, one streamed array
     path("books/<int:pk>/", BookDetailView.as_view(), name="book-detail"),  # GET one
     path("books/create/", BookCreateView.as_view(), name="book-create"),  # POST
-    path("books/update/", BookUpdateView.as_view(), name="book-update"),  # PUT/PATCH
-    path("books/delete/", BookDeleteView.as_view(), name="book-delete"),  # DELETE
+    path("books/update/<int:pk>/", BookUpdateView.as_view(), name="book-update"),  # PUT/PATCH
+    path("books/delete/<int:pk>/", BookDeleteView.as_view(), name="book-delete"),  # DELETE
+    path("books/bulk/", BookBulkView.as_view(), name="book-bulk"),  # POST/PATCH/DELETE many
+    path("export/<str:kind>.<str:fmt>", CatalogExportView.as_view(), name="catalog-export"),  # GET, streamed
+    path("import/<str:kind>.<str:fmt>", CatalogImportView.as_view(), name="catalog-import"),  # POST raw body
+    path("authors/", AuthorListView.as_view(), name="author-list"),  # GET all, nested books
+    path("authors/summary/", AuthorSummaryListView.as_view(), name="author-summary"),  # GET all, counts only
+    path("authors/<int:pk>/", AuthorDetailView.as_view(), name="author-detail"),  # GET one
+    path("stats/", StatsView.as_view(), name="stats"),  # GET aggregates from the rollup
 ]
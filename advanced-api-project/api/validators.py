@@ -0,0 +1,206 @@
+"""
+Validators shared by the book serializers, the bulk endpoint and imports.
+
+``validate_publication_year`` reads the year from a cache that is refreshed
+when the calendar year rolls over, rather than building a datetime for every
+value. ``BatchUniqueListSerializer`` is the ``many=True`` mode of a model
+serializer: related primary keys are resolved with one query per field and
+``unique_together`` constraints with one query per batch of rows, instead of
+one query per row each, and errors are reported against the index of the
+offending item.
+"""
+
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator
+
+UNIQUE_CHECK_BATCH_SIZE = 1000
+
+# (current year, time.time() at which it stops being current)
+_current_year = (None, 0.0)
+
+
+def current_year():
+    """The local calendar year; recomputed only once the year is over."""
+    global _current_year
+    year, expires = _current_year
+    if time.time() >= expires:
+        year = datetime.now().year
+        _current_year = (year, datetime(year + 1, 1, 1).timestamp())
+    return year
+
+
+def validate_publication_year(value):
+    """Reject years in the future and anything that is not a 4-digit year."""
+    year = current_year()
+    if value > year:
+        raise serializers.ValidationError(
+            f"Publication year cannot be in the future. Current year is {year}."
+        )
+    if value < 1000:
+        raise serializers.ValidationError(
+            "Publication year must be a valid 4-digit year."
+        )
+    return value
+
+
+def existing_unique_keys(queryset, fields, attrs_list, batch_size=UNIQUE_CHECK_BATCH_SIZE):
+    """
+    Map the ``fields`` values of ``attrs_list`` that are already stored in
+    ``queryset`` to the pk of the row holding them.
+
+    Each batch is one query with an ``__in`` filter per field over the
+    constraint's index; it may over-fetch combinations, so rows are matched
+    exactly in Python.
+    """
+    keys = list({tuple(attrs[field] for field in fields) for attrs in attrs_list})
+    found = {}
+    for start in range(0, len(keys), batch_size):
+        batch = set(keys[start : start + batch_size])
+        lookups = {
+            f"{field}__in": {key[position] for key in batch}
+            for position, field in enumerate(fields)
+        }
+        for row in queryset.filter(**lookups).values_list(*fields, "pk"):
+            if row[:-1] in batch:
+                found[row[:-1]] = row[-1]
+    return found
+
+
+class BatchUniqueListSerializer(serializers.ListSerializer):
+    """
+    ``many=True`` validation that checks unique_together per batch.
+
+    Related primary keys are loaded for the whole payload up front. The
+    child's UniqueTogetherValidators are set aside while items are validated
+    one by one, then run for all valid items at once. Items that clash with a
+    stored row or with an earlier item of the same payload get the
+    validator's usual error at their own index.
+    """
+
+    def to_internal_value(self, data):
+        prefetched = self.prefetch_related_fields(data)
+        try:
+            return self.validate_items(data)
+        finally:
+            # Back to the class's own lookup
+            for field in prefetched:
+                del field.to_internal_value
+
+    def validate_items(self, data):
+        unique = [v for v in self.child.validators if isinstance(v, UniqueTogetherValidator)]
+        if not unique:
+            return super().to_internal_value(data)
+
+        original = self.child.validators
+        self.child.validators = [v for v in original if v not in unique]
+        self._items, self._calls = [], 0
+        errors = {}
+        try:
+            super().to_internal_value(data)
+        except serializers.ValidationError as exc:
+            if not self._calls:
+                raise  # not a list, empty, too long...
+            detail = exc.detail
+            errors = dict(detail) if isinstance(detail, dict) else dict(enumerate(detail))
+            errors = {index: error for index, error in errors.items() if error}
+        finally:
+            self.child.validators = original
+
+        valid = [(index, attrs) for index, attrs in self._items if index not in errors]
+        for validator in unique:
+            errors.update(self.unique_errors(validator, valid))
+            valid = [(index, attrs) for index, attrs in valid if index not in errors]
+        if errors:
+            if getattr(api_settings, "LIST_SERIALIZER_ERRORS_AS_DICT", False):
+                raise serializers.ValidationError(dict(sorted(errors.items())))
+            raise serializers.ValidationError([errors.get(i, {}) for i in range(len(data))])
+        return [attrs for _, attrs in valid]
+
+    def prefetch_related_fields(self, data):
+        """
+        Load every object the payload points at through a writable
+        PrimaryKeyRelatedField with one ``in_bulk()`` per field.
+
+        Each such field looks its values up in the result for the rest of the
+        validation instead of running a query per item. Returns the fields
+        that were switched over.
+        """
+        if not isinstance(data, list):
+            return []
+        fields = []
+        for field in self.child.fields.values():
+            if (
+                type(field) is not PrimaryKeyRelatedField
+                or field.read_only
+                or field.pk_field is not None
+            ):
+                continue
+            to_python = field.get_queryset().model._meta.pk.to_python
+            pks = set()
+            for item in data:
+                value = item.get(field.field_name) if isinstance(item, Mapping) else None
+                if value is not None and not isinstance(value, bool):
+                    try:
+                        pks.add(to_python(value))
+                    except (DjangoValidationError, TypeError, ValueError):
+                        pass  # left to the field's own "incorrect type" error
+            found = field.get_queryset().in_bulk(pks)
+            field.to_internal_value = _prefetched_lookup(field, to_python, found)
+            fields.append(field)
+        return fields
+
+    def run_child_validation(self, data):
+        index = self._calls
+        self._calls += 1
+        attrs = super().run_child_validation(data)
+        self._items.append((index, attrs))
+        return attrs
+
+    def unique_errors(self, validator, items):
+        """{index: error} for items breaking ``validator``'s constraint."""
+        fields = validator.fields
+        # Items missing a field (partial updates) are left to the database
+        items = [(index, attrs) for index, attrs in items if all(f in attrs for f in fields)]
+        column_attrs = [
+            {field: getattr(attrs[field], "pk", attrs[field]) for field in fields}
+            for _, attrs in items
+        ]
+        queryset = validator.queryset
+        instance = getattr(self, "instance", None)
+        if instance is not None and hasattr(instance, "pk"):
+            queryset = queryset.exclude(pk=instance.pk)
+        taken = existing_unique_keys(queryset, fields, column_attrs)
+
+        message = validator.message.format(field_names=", ".join(fields))
+        errors, seen = {}, set()
+        for (index, _), attrs in zip(items, column_attrs):
+            key = tuple(attrs[field] for field in fields)
+            if key in taken or key in seen:
+                errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: [message]}
+            seen.add(key)
+        return errors
+
+
+def _prefetched_lookup(field, to_python, found):
+    """A to_internal_value() for ``field`` that reads ``found`` (pk -> object)."""
+    lookup = type(field).to_internal_value
+
+    def to_internal_value(data):
+        if isinstance(data, bool):
+            return lookup(field, data)
+        try:
+            pk = to_python(data)
+        except (DjangoValidationError, TypeError, ValueError):
+            return lookup(field, data)
+        if pk not in found:
+            field.fail("does_not_exist", pk_value=data)
+        return found[pk]
+
+    return to_internal_value
@@ -1,13 +1,36 @@
-from rest_framework import generics, filters
+import codecs
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from rest_framework import generics, filters, serializers, status
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters import rest_framework
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Book
-from .serializers import BookSerializer
+from .caching import CachedListMixin, bump_cache_version
+from .exchange import EXPORT_FIELDS, FORMATS, import_stream, iter_export
+from .fastread import ReadPlanListMixin
+from .models import Author, Book, BookStat
+from .pagination import StreamingListMixin
+from .serializers import (
+    BULK_BATCH_SIZE,
+    BULK_MAX_ITEMS,
+    AuthorSerializer,
+    AuthorSimpleSerializer,
+    BookBulkSerializer,
+    BookSerializer,
+)
 
 
-class BookListView(generics.ListAPIView):
+class BookListView(CachedListMixin, ReadPlanListMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    # Search reads author names, so author writes invalidate too
+    cache_models = (Book, Author)
 
     #  Enable filtering, searching, ordering
     filter_backends = [
@@ -16,12 +39,225 @@ class BookListView(generics.ListAPIView):
         filters.OrderingFilter,
     ]
 
-    # Filter by exact matches
-    filterset_fields = ["title", "author", "publication_year"]
+    # Filter by exact matches, plus ?publication_year__gte= / __lte= ranges
+    filterset_fields = {
+        "title": ["exact"],
+        "author": ["exact"],
+        "publication_year": ["exact", "gte", "lte"],
+    }
 
-    # Search in these fields (case-insensitive)
-    search_fields = ["title", "author"]
+    # Search in these fields (case-insensitive), by author name rather than id
+    search_fields = ["title", "author__name"]
 
     # Allow ordering
     ordering_fields = ["title", "publication_year"]
     ordering = ["title"]  # default ordering
+
+
+class BookStreamView(StreamingListMixin, BookListView):
+    # Opt-in "export all": the same filters and ordering, one streamed JSON array
+    pass
+
+
+class BookDetailView(generics.RetrieveAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+
+
+class BookCreateView(generics.CreateAPIView):
+    """
+    POST one book, or a list of up to BULK_MAX_ITEMS books created together.
+
+    A list is all-or-nothing: if any item is invalid nothing is written and
+    the errors come back by index. Use BookBulkView to write the valid items
+    of a partly invalid list.
+    """
+
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_serializer(self, *args, **kwargs):
+        if isinstance(kwargs.get("data"), list):
+            kwargs.update(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+        return super().get_serializer(*args, **kwargs)
+
+
+class BookUpdateView(generics.UpdateAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class BookDeleteView(generics.DestroyAPIView):
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
+    permission_classes = [IsAuthenticated]
+
+
+class BookBulkView(APIView):
+    """
+    Bulk book endpoint; every method takes up to BULK_MAX_ITEMS items.
+
+    - POST   [{title, publication_year, author}, ...]       create (upsert)
+    - PATCH  [{id, <fields to change>}, ...]                 partial update
+    - DELETE {"ids": [...]}                                  delete
+
+    Valid items are written even when others fail. ``results`` and ``errors``
+    are keyed by the item's index in the payload. The status is 200/201 when
+    every item succeeded, 207 when some did and 400 when none did.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        return self.write(request, partial=False)
+
+    def patch(self, request):
+        return self.write(request, partial=True)
+
+    def write(self, request, partial):
+        serializer = BookBulkSerializer(data=request.data, many=True, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        try:
+            if partial:
+                results = serializer.bulk_update(serializer.validated_data)
+            else:
+                results = serializer.create(serializer.validated_data)
+        except IntegrityError:
+            # Lost a race with a concurrent writer; nothing was committed
+            return Response(
+                {"detail": "Conflicting concurrent write, please retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        success = status.HTTP_200_OK if partial else status.HTTP_201_CREATED
+        return self.report(results, serializer.item_errors, success)
+
+    def delete(self, request):
+        ids = serializers.ListField(
+            child=serializers.IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS
+        ).run_validation(
+            request.data.get("ids") if isinstance(request.data, dict) else None
+        )
+        deleted, missing, stat_deltas = 0, [], Counter()
+        with transaction.atomic():
+            for start in range(0, len(ids), BULK_BATCH_SIZE):
+                batch = set(ids[start : start + BULK_BATCH_SIZE])
+                found = set()
+                for pk, author_id, year in (
+                    Book.objects.select_for_update()
+                    .filter(pk__in=batch)
+                    .order_by()
+                    .values_list("pk", "author_id", "publication_year")
+                ):
+                    found.add(pk)
+                    stat_deltas[author_id, year] -= 1
+                missing.extend(sorted(batch - found))
+                # Nothing references Book, so a plain DELETE is all delete()
+                # would do, minus the per-row post_delete receivers; their
+                # rollup and cache work is done once for the whole request below
+                deleted += Book.objects.filter(pk__in=found)._raw_delete(Book.objects.db)
+            if deleted:
+                BookStat.objects.apply_deltas(stat_deltas)
+                bump_cache_version(Book)
+        return Response({"deleted": deleted, "missing": missing})
+
+    def report(self, results, errors, success):
+        if not errors:
+            code = success
+        elif results:
+            code = status.HTTP_207_MULTI_STATUS
+        else:
+            code = status.HTTP_400_BAD_REQUEST
+        return Response(
+            {"results": results, "errors": {str(i): e for i, e in sorted(errors.items())}},
+            status=code,
+        )
+
+
+class AuthorListView(ReadPlanListMixin, generics.ListAPIView):
+    # Nested books: one query for authors + counts, one for all their books
+    queryset = Author.objects.with_books()
+    serializer_class = AuthorSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    search_fields = ["name"]
+    ordering_fields = ["name", "book_count"]
+    ordering = ["name"]
+
+
+class AuthorSummaryListView(ReadPlanListMixin, generics.ListAPIView):
+    # Counts only: a single GROUP BY query
+    queryset = Author.objects.with_book_counts()
+    serializer_class = AuthorSimpleSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    search_fields = ["name"]
+    ordering_fields = ["name", "book_count"]
+    ordering = ["name"]
+
+
+class AuthorDetailView(generics.RetrieveAPIView):
+    queryset = Author.objects.with_books()
+    serializer_class = AuthorSerializer
+
+
+class StatsView(APIView):
+    """
+    Dashboard aggregates: books per author, per decade and per publication
+    year. Served from the BookStat rollup, so the cost does not depend on the
+    number of books.
+    """
+
+    def get(self, request):
+        return Response(BookStat.objects.summary())
+
+
+class _IgnoreAcceptHeader(BaseContentNegotiation):
+    """Export/import bodies are CSV or NDJSON whatever the Accept header says."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+# Batches before the bad bytes are already committed; say so
+_UNDECODABLE_BODY = "Request body is not valid UTF-8; rows before the error may have been imported."
+
+
+def _check_kind_and_format(kind, fmt):
+    if kind not in EXPORT_FIELDS or fmt not in FORMATS:
+        raise NotFound("Use books or authors, as csv or ndjson.")
+
+
+class CatalogExportView(APIView):
+    """GET export/<books|authors>.<csv|ndjson>: the whole table, streamed."""
+
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    content_negotiation_class = _IgnoreAcceptHeader
+
+    def get(self, request, kind, fmt):
+        _check_kind_and_format(kind, fmt)
+        response = StreamingHttpResponse(
+            iter_export(kind, fmt), content_type=FORMATS[fmt]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+class CatalogImportView(APIView):
+    """POST import/<books|authors>.<csv|ndjson> with the file as the raw body."""
+
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = _IgnoreAcceptHeader
+
+    def post(self, request, kind, fmt):
+        _check_kind_and_format(kind, fmt)
+        if request.stream is None:
+            raise ParseError("Empty request body.")
+        # Read the body line by line rather than through request.data
+        try:
+            report = import_stream(kind, fmt, codecs.iterdecode(request.stream, "utf-8"))
+        except UnicodeDecodeError:
+            raise ParseError(_UNDECODABLE_BODY)
+        return Response(report, status=status.HTTP_200_OK)
@@ -111,11 +111,25 @@ DATABASES = {
     }
 }
 
+# --------------------------------------------------------------------
+# Cache (per-process; use a shared backend such as Redis in production so
+# every worker sees permission changes)
+# --------------------------------------------------------------------
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "libraryproject",
+    }
+}
+
 # --------------------------------------------------------------------
 # Authentication
 # --------------------------------------------------------------------
 AUTH_USER_MODEL = "bookshelf.CustomUser"
 
+# ModelBackend with a cross-request permission cache (see bookshelf/permissions.py)
+AUTHENTICATION_BACKENDS = ["bookshelf.backends.CachedModelBackend"]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"
@@ -1,5 +1,9 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.db.models.signals import m2m_changed, post_delete, post_migrate
+from django.dispatch import receiver
+from django.contrib.auth.models import AbstractUser, BaseUserManager, Group, Permission
+
+from .permissions import bump_permissions_version
 
 
 class CustomUserManager(BaseUserManager):
@@ -45,3 +49,19 @@ class Book(models.Model):
 
     def __str__(self):
         return self.title
+
+
+# --- Permission cache invalidation (see bookshelf.permissions) ---
+@receiver(m2m_changed, sender=CustomUser.groups.through)
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def permissions_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_permissions_version()
+
+
+# Deleting a group or permission drops its M2M rows without m2m_changed;
+# migrations create permissions that superusers hold implicitly
+post_delete.connect(bump_permissions_version, sender=Group)
+post_delete.connect(bump_permissions_version, sender=Permission)
+post_migrate.connect(bump_permissions_version, dispatch_uid="bookshelf_permissions_version")
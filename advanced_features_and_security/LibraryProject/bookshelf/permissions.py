@@ -0,0 +1,60 @@
+"""
+Shared, cross-request cache of user permissions.
+
+ModelBackend loads a user's permissions with two multi-join queries and keeps
+them only on that request's user object, so every request that reaches a
+``@permission_required`` view pays for them again. Here each user's
+permission set is kept in the cache, tagged with a global permissions
+version. Any change to group or user permission M2Ms, or to groups and
+permissions themselves, replaces the version (see the receivers in
+``bookshelf.models``), so stale sets are ignored and expire on their own.
+
+Kept apart from ``bookshelf.backends`` because models.py imports it, and
+Django's auth backends module needs the user model to be loaded.
+"""
+
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+
+PERMISSIONS_VERSION_KEY = "auth:permissions-version"
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+
+
+def _user_key(user_obj):
+    # is_superuser is part of the key: superusers get every permission
+    return f"auth:permissions:{user_obj.pk}:{int(user_obj.is_superuser)}"
+
+
+def bump_permissions_version(**kwargs):
+    """
+    Invalidate every cached permission set; usable as a signal receiver.
+
+    A fresh random token rather than a counter, so an evicted version key can
+    never bring back sets cached under an earlier value. The bump waits for
+    the surrounding transaction to commit, like the write it reacts to.
+    """
+    transaction.on_commit(
+        lambda: cache.set(PERMISSIONS_VERSION_KEY, uuid.uuid4().hex, None)
+    )
+
+
+def cached_permissions(user_obj, load):
+    """
+    ``user_obj``'s permission set from the cache, or ``load(user_obj)``.
+
+    One cache round trip fetches both the version and the user's entry.
+    """
+    key = _user_key(user_obj)
+    found = cache.get_many([PERMISSIONS_VERSION_KEY, key])
+    version = found.get(PERMISSIONS_VERSION_KEY)
+    if version is None:
+        cache.add(PERMISSIONS_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(PERMISSIONS_VERSION_KEY)
+    cached = found.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    perms = load(user_obj)
+    cache.set(key, (version, perms), PERMISSIONS_CACHE_TIMEOUT)
+    return perms
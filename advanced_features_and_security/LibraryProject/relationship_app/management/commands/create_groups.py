@@ -1,54 +1,95 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import Group, Permission
-from django.contrib.contenttypes.models import ContentType
-from relationship_app.models import Author, Book, Library
+from django.db import transaction
+
+# App whose permissions the groups below are built from
+APP_LABEL = "relationship_app"
+
+# Group name -> codenames of APP_LABEL permissions it should hold, exactly
+GROUP_PERMISSIONS = {
+    "Admins": [
+        "can_view_author",
+        "can_create_author",
+        "can_edit_author",
+        "can_delete_author",
+        "can_view_book",
+        "can_create_book",
+        "can_edit_book",
+        "can_delete_book",
+        "can_view_library",
+        "can_create_library",
+        "can_edit_library",
+        "can_delete_library",
+    ],
+    "Editors": [
+        "can_create_author",
+        "can_edit_author",
+        "can_create_book",
+        "can_edit_book",
+        "can_create_library",
+        "can_edit_library",
+    ],
+    "Viewers": [
+        "can_view_author",
+        "can_view_book",
+        "can_view_library",
+    ],
+}
 
 
 class Command(BaseCommand):
-    help = "Create default groups and assign permissions"
+    help = (
+        "Create default groups and sync their permissions with GROUP_PERMISSIONS; "
+        "safe to run on every deploy"
+    )
 
+    @transaction.atomic
     def handle(self, *args, **kwargs):
-        # Define groups and their permissions
-        groups_permissions = {
-            "Admins": [
-                "can_view_author",
-                "can_create_author",
-                "can_edit_author",
-                "can_delete_author",
-                "can_view_book",
-                "can_create_book",
-                "can_edit_book",
-                "can_delete_book",
-                "can_view_library",
-                "can_create_library",
-                "can_edit_library",
-                "can_delete_library",
-            ],
-            "Editors": [
-                "can_create_author",
-                "can_edit_author",
-                "can_create_book",
-                "can_edit_book",
-                "can_create_library",
-                "can_edit_library",
-            ],
-            "Viewers": [
-                "can_view_author",
-                "can_view_book",
-                "can_view_library",
-            ],
+        # All permissions of the spec in one query, by codename within the app
+        codenames = {codename for perms in GROUP_PERMISSIONS.values() for codename in perms}
+        permissions = {
+            perm.codename: perm
+            for perm in Permission.objects.filter(
+                content_type__app_label=APP_LABEL, codename__in=codenames
+            )
         }
+        for codename in sorted(codenames - permissions.keys()):
+            self.stdout.write(
+                self.style.WARNING(f"Permission {APP_LABEL}.{codename} not found!")
+            )
+
+        groups = {
+            group.name: group
+            for group in Group.objects.filter(name__in=GROUP_PERMISSIONS)
+        }
+        missing = [name for name in GROUP_PERMISSIONS if name not in groups]
+        if missing:
+            Group.objects.bulk_create(
+                [Group(name=name) for name in missing], ignore_conflicts=True
+            )
+            groups.update(
+                (group.name, group) for group in Group.objects.filter(name__in=missing)
+            )
+
+        # Current APP_LABEL permissions of every group, in one query
+        current = {group.pk: set() for group in groups.values()}
+        for group_id, permission_id in Group.permissions.through.objects.filter(
+            group__in=groups.values(), permission__content_type__app_label=APP_LABEL
+        ).values_list("group_id", "permission_id"):
+            current[group_id].add(permission_id)
 
-        # Loop through groups and assign permissions
-        for group_name, perms in groups_permissions.items():
-            group, created = Group.objects.get_or_create(name=group_name)
-            for perm_codename in perms:
-                try:
-                    perm = Permission.objects.get(codename=perm_codename)
-                    group.permissions.add(perm)
-                except Permission.DoesNotExist:
-                    self.stdout.write(
-                        self.style.WARNING(f"Permission {perm_codename} not found!")
-                    )
-            group.save()
-            self.stdout.write(self.style.SUCCESS(f"Group '{group_name}' updated."))
+        for name, perms in GROUP_PERMISSIONS.items():
+            group = groups[name]
+            wanted = {permissions[codename].pk for codename in perms if codename in permissions}
+            to_add = wanted - current[group.pk]
+            to_remove = current[group.pk] - wanted
+            if to_add:
+                group.permissions.add(*to_add)
+            if to_remove:
+                group.permissions.remove(*to_remove)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Group '{name}' updated "
+                    f"({len(to_add)} added, {len(to_remove)} removed)."
+                )
+            )
@@ -1,11 +1,17 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
 
 
-# --- Custom User Manager ---
-class CustomUserManager(BaseUserManager):
+# --- Custom User QuerySet / Manager ---
+class CustomUserQuerySet(models.QuerySet):
+    def with_profile(self):
+        """Users with their profile joined in, for role checks without extra queries."""
+        return self.select_related("userprofile")
+
+
+class CustomUserManager(BaseUserManager.from_queryset(CustomUserQuerySet)):
     def create_user(
         self, username, email=None, password=None, date_of_birth=None, **extra_fields
     ):
@@ -36,6 +42,22 @@ class CustomUserManager(BaseUserManager):
             username, email, password, date_of_birth, **extra_fields
         )
 
+    def bulk_create_with_profiles(self, users, role="Member", batch_size=None):
+        """
+        Insert ``users`` and a UserProfile with ``role`` for each of them.
+
+        Two bulk inserts instead of an INSERT plus a post_save profile write
+        per user (bulk_create sends no signals). Passwords must already be
+        hashed, e.g. with ``user.set_password()``.
+        """
+        with transaction.atomic(using=self.db):
+            users = self.bulk_create(users, batch_size=batch_size)
+            UserProfile.objects.using(self.db).bulk_create(
+                [UserProfile(user=user, role=role) for user in users],
+                batch_size=batch_size,
+            )
+        return users
+
 
 # --- Custom User Model ---
 class CustomUser(AbstractUser):
@@ -49,6 +71,23 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return self.username
 
+    @property
+    def profile(self):
+        """
+        The user's UserProfile; free when loaded through ``with_profile()``.
+
+        Users saved before profiles existed get one on first access.
+        """
+        try:
+            return self.userprofile
+        except UserProfile.DoesNotExist:
+            self.userprofile, _ = UserProfile.objects.get_or_create(user=self)
+            return self.userprofile
+
+    @property
+    def role(self):
+        return self.profile.role
+
 
 # --- Author model (with permissions) ---
 class Author(models.Model):
@@ -123,17 +162,36 @@ class UserProfile(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.role}"
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._stored_role = self.role
 
-# --- Signals to create/save UserProfile ---
-@receiver(post_save, sender=CustomUser)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
-        UserProfile.objects.create(user=instance)
+    @property
+    def has_changes(self):
+        return self._state.adding or self.role != self._stored_role
 
 
+# Role as stored, to skip saving a profile nobody changed. Set for every
+# instance, loaded or built (bulk_create saves without save()), and moved
+# along by UserProfile.save().
+@receiver(post_init, sender=UserProfile)
+def remember_stored_role(sender, instance, **kwargs):
+    instance._stored_role = instance.__dict__.get("role")
+
+
+# --- Signal keeping UserProfile in step with CustomUser ---
 @receiver(post_save, sender=CustomUser)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, "userprofile"):
-        instance.userprofile.save()
-    else:
-        UserProfile.objects.create(user=instance)
+def sync_user_profile(sender, instance, created, raw=False, **kwargs):
+    """
+    One profile write on user creation, none on later saves unless the
+    loaded profile was edited; profiles that were never loaded are left
+    alone (``CustomUser.profile`` creates missing ones on demand).
+    """
+    if raw:
+        return
+    if created:
+        instance.userprofile = UserProfile.objects.create(user=instance)
+        return
+    profile = CustomUser.userprofile.related.get_cached_value(instance, None)
+    if profile is not None and profile.has_changes:
+        profile.save()
@@ -1,3 +1,114 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .management.commands.create_groups import APP_LABEL, GROUP_PERMISSIONS
+from .models import CustomUser, UserProfile
+
+
+def profile_queries(context):
+    return [q["sql"] for q in context.captured_queries if "relationship_app_userprofile" in q["sql"]]
+
+
+class UserProfileLifecycleTests(TestCase):
+    def test_user_creation_writes_the_profile_once(self):
+        with CaptureQueriesContext(connection) as ctx:
+            user = CustomUser.objects.create_user("reader", password="pass12345")
+        self.assertEqual(len(profile_queries(ctx)), 1)
+        self.assertEqual(user.role, "Member")
+
+    def test_plain_save_leaves_the_profile_alone(self):
+        user = CustomUser.objects.create_user("reader", password="pass12345")
+        with CaptureQueriesContext(connection) as ctx:
+            user.first_name = "A"
+            user.save()
+        self.assertEqual(profile_queries(ctx), [])
+
+        user = CustomUser.objects.with_profile().get(pk=user.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            user.save()
+        self.assertEqual(profile_queries(ctx), [])
+
+    def test_edited_profile_is_saved_with_the_user(self):
+        user = CustomUser.objects.with_profile().get(
+            pk=CustomUser.objects.create_user("reader", password="pass12345").pk
+        )
+        user.profile.role = "Librarian"
+        user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).role, "Librarian")
+
+    def test_role_from_joined_profile_costs_no_query(self):
+        pk = CustomUser.objects.create_user("reader", password="pass12345").pk
+        user = CustomUser.objects.with_profile().get(pk=pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(user.role, "Member")
+
+    def test_missing_profile_is_created_on_access(self):
+        user = CustomUser.objects.create_user("reader", password="pass12345")
+        UserProfile.objects.filter(user=user).delete()
+        user = CustomUser.objects.get(pk=user.pk)
+        self.assertEqual(user.role, "Member")
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_bulk_create_with_profiles(self):
+        users = [CustomUser(username=f"user{i}") for i in range(50)]
+        # Savepoint, users, profiles, release
+        with self.assertNumQueries(4):
+            users = CustomUser.objects.bulk_create_with_profiles(users, role="Librarian")
+        self.assertEqual(UserProfile.objects.filter(role="Librarian").count(), 50)
+
+        # The attached profiles count as stored: no write on a later save
+        with CaptureQueriesContext(connection) as ctx:
+            users[0].save()
+        self.assertEqual(profile_queries(ctx), [])
+
+
+class CreateGroupsCommandTests(TestCase):
+    def run_command(self):
+        call_command("create_groups", stdout=StringIO())
+
+    def group_permissions(self):
+        return {
+            group.name: sorted(group.permissions.values_list("codename", flat=True))
+            for group in Group.objects.filter(name__in=GROUP_PERMISSIONS)
+        }
+
+    def test_first_run_creates_groups_in_bulk(self):
+        # Transaction, permissions, groups, group insert, groups again,
+        # memberships, then one add() (read + insert) per group
+        with self.assertNumQueries(13):
+            self.run_command()
+        self.assertEqual(
+            self.group_permissions(),
+            {name: sorted(perms) for name, perms in GROUP_PERMISSIONS.items()},
+        )
+
+    def test_repeat_run_makes_no_writes(self):
+        self.run_command()
+        before = self.group_permissions()
+        # Transaction, permissions, groups, memberships
+        with self.assertNumQueries(5):
+            self.run_command()
+        self.assertEqual(self.group_permissions(), before)
+
+    def test_drift_is_corrected_within_the_app_only(self):
+        self.run_command()
+        viewers = Group.objects.get(name="Viewers")
+        extra = Permission.objects.get(
+            content_type__app_label=APP_LABEL, codename="can_delete_book"
+        )
+        other_app = Permission.objects.exclude(content_type__app_label=APP_LABEL).first()
+        viewers.permissions.add(extra, other_app)
+        viewers.permissions.remove(
+            Permission.objects.get(content_type__app_label=APP_LABEL, codename="can_view_book")
+        )
 
-# Create your tests here.
+        self.run_command()
+        self.assertEqual(
+            set(viewers.permissions.values_list("codename", flat=True)),
+            set(GROUP_PERMISSIONS["Viewers"]) | {other_app.codename},
+        )
@@ -0,0 +1,108 @@
+"""
+Response caching for read-only list endpoints.
+
+Cached entries are the rendered response bytes, keyed on the view, the
+normalized query string, the caller's permission scope and a version token
+per model the response depends on. Any write to one of those models replaces
+its token (see the receivers in ``api.models``), so stale entries are simply
+never looked up again and expire on their own.
+"""
+
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+
+def _version_key(model):
+    return f"api:cache-version:{model._meta.label_lower}"
+
+
+def get_cache_version(model):
+    """Current version token for ``model``, created on first use."""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_cache_version(*models):
+    """
+    Invalidate every cached response built from ``models``.
+
+    A fresh random token rather than a counter, so an evicted version key can
+    never bring back entries cached under an earlier value. The bump waits for
+    the surrounding transaction to commit; bumping earlier would let a
+    concurrent request cache the pre-commit rows under the new version.
+    """
+    keys = [_version_key(model) for model in models]
+    transaction.on_commit(
+        lambda: cache.set_many({key: uuid.uuid4().hex for key in keys}, None)
+    )
+
+
+class CachedListMixin:
+    """
+    Serve ``list()`` responses from the cache as pre-rendered bytes.
+
+    Set ``cache_models`` to every model the serialized output (or the
+    filters/search) reads from. Only renderers in ``cacheable_formats`` are
+    cached; the browsable API embeds per-user markup and is always rendered.
+    """
+
+    cache_models = ()
+    cacheable_formats = ("json",)
+    response_cache_timeout = RESPONSE_CACHE_TIMEOUT
+
+    def get_cache_scope(self, request):
+        """What the caller may see; responses are never shared across scopes."""
+        user = request.user
+        if not user or not user.is_authenticated:
+            return "anon"
+        return "staff" if user.is_staff else "user"
+
+    def get_response_cache_key(self, request):
+        params = sorted(
+            (name, sorted(values)) for name, values in request.query_params.lists()
+        )
+        versions = [get_cache_version(model) for model in self.cache_models]
+        raw = repr(
+            (
+                type(self).__module__,
+                type(self).__qualname__,
+                request.accepted_renderer.format,
+                self.get_cache_scope(request),
+                versions,
+                params,
+            )
+        )
+        return f"api:response:{hashlib.md5(raw.encode()).hexdigest()}"
+
+    def list(self, request, *args, **kwargs):
+        if request.accepted_renderer.format not in self.cacheable_formats:
+            return super().list(request, *args, **kwargs)
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        self._response_cache_key = key
+        return super().list(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, "_response_cache_key", None)
+        if key is not None and response.status_code == 200:
+            response.render()
+            cache.set(
+                key,
+                (response.content, response["Content-Type"]),
+                self.response_cache_timeout,
+            )
+        return response
@@ -0,0 +1,258 @@
+"""
+Streaming CSV / NDJSON export and import for the book catalog.
+
+Exports walk the table in primary-key order with ``.iterator(chunk_size=...)``
+and yield text as they go, so memory stays flat however many rows there are.
+Imports parse their input line by line and write in batches of
+IMPORT_BATCH_SIZE with ``bulk_create``; author names are resolved through an
+in-memory name -> id map loaded once per import, and unknown authors are
+created on the fly.
+
+Used by the ``export_catalog`` / ``import_catalog`` management commands and by
+``CatalogExportView`` / ``CatalogImportView``.
+"""
+
+import csv
+import json
+import re
+
+from django.db import transaction
+from rest_framework import serializers
+
+from .caching import bump_cache_version
+from .models import Author, Book
+
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 1000
+# Only the first errors are kept so a bad file cannot grow the report unboundedly
+MAX_REPORTED_ERRORS = 100
+
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+# Exported columns per kind; "__" paths are flattened to "_" in the output
+EXPORT_FIELDS = {
+    "books": (Book, ("id", "title", "author_id", "author__name")),
+    "authors": (Author, ("id", "name", "bio")),
+}
+
+
+# ==================== EXPORT ====================
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export(kind, fmt):
+    """Yield the ``kind`` table as ``fmt`` text, EXPORT_CHUNK_SIZE rows per chunk."""
+    model, fields = EXPORT_FIELDS[kind]
+    columns = [field.replace("__", "_") for field in fields]
+    rows = (
+        model.objects.order_by("pk")
+        .values_list(*fields)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(columns)
+        encode = writer.writerow
+    else:
+        def encode(row):
+            return json.dumps(dict(zip(columns, row))) + "\n"
+
+    chunk = []
+    for row in rows:
+        chunk.append(encode(row))
+        if len(chunk) == EXPORT_CHUNK_SIZE:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+# ==================== IMPORT ====================
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.existing = 0
+        self.authors_created = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "existing": self.existing,
+            "authors_created": self.authors_created,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+def iter_records(fmt, lines):
+    """
+    Yield ``(line number, dict)`` per record of a CSV (with header) or NDJSON
+    stream; malformed NDJSON lines yield ``(line number, None)``.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield number, record if isinstance(record, dict) else None
+
+
+def import_stream(kind, fmt, lines, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Load ``kind`` records from ``lines`` (an iterable of text lines).
+
+    Returns:
+        dict: counts of created/existing rows and authors, and the first
+        MAX_REPORTED_ERRORS errors with their line numbers
+    """
+    importer = _BookImporter if kind == "books" else _AuthorImporter
+    return importer(batch_size).run(iter_records(fmt, lines)).as_dict()
+
+
+class _AuthorImporter:
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        # name -> id for every author; the only per-import state besides a batch
+        self.author_ids = dict(Author.objects.values_list("name", "pk"))
+
+    def run(self, records):
+        batch = []
+        try:
+            for line, record in records:
+                if record is None:
+                    self.report.error(line, "Malformed record.")
+                    continue
+                try:
+                    batch.append((line, self.clean(record)))
+                except serializers.ValidationError as exc:
+                    self.report.error(line, _first_message(exc))
+                    continue
+                if len(batch) >= self.batch_size:
+                    self.flush(batch)
+                    batch = []
+            if batch:
+                self.flush(batch)
+        finally:
+            # bulk_create sends no post_save signals; batches already flushed
+            # stay committed when reading the input fails part way
+            bump_cache_version(Author, Book)
+        return self.report
+
+    def clean(self, record):
+        name = _text(record, "name")
+        if not name:
+            raise serializers.ValidationError("name is required.")
+        if len(name) > Author._meta.get_field("name").max_length:
+            raise serializers.ValidationError("name is too long.")
+        return name, _text(record, "bio")
+
+    def flush(self, batch):
+        with transaction.atomic():
+            created = self.create_authors(dict(attrs for _, attrs in batch))
+        self.report.created += len(created)
+        self.report.existing += len(batch) - len(created)
+
+    def create_authors(self, bios):
+        """Create authors for names (keys of ``bios``) not in the map yet; one INSERT."""
+        missing = [
+            Author(name=name, bio=bio)
+            for name, bio in bios.items()
+            if name not in self.author_ids
+        ]
+        if missing:
+            Author.objects.bulk_create(missing)
+            self.author_ids.update((author.name, author.pk) for author in missing)
+        return missing
+
+
+class _BookImporter(_AuthorImporter):
+    def __init__(self, batch_size):
+        super().__init__(batch_size)
+        self.known_author_ids = set(self.author_ids.values())
+
+    def clean(self, record):
+        title = _text(record, "title")
+        if not title:
+            raise serializers.ValidationError("title is required.")
+        if len(title) > Book._meta.get_field("title").max_length:
+            raise serializers.ValidationError("title is too long.")
+
+        author_name = _text(record, "author_name")
+        author_id = None
+        if not author_name:
+            author_id = _integer(
+                record, "author_id", "author_name or author_id is required."
+            )
+            if author_id not in self.known_author_ids:
+                raise serializers.ValidationError(f"Unknown author_id {author_id}.")
+        return {"title": title, "author_id": author_id, "author_name": author_name}
+
+    def flush(self, batch):
+        with transaction.atomic():
+            created = self.create_authors(
+                {attrs["author_name"]: "" for _, attrs in batch if attrs["author_name"]}
+            )
+            self.known_author_ids.update(author.pk for author in created)
+            self.report.authors_created += len(created)
+            books = []
+            for _, attrs in batch:
+                name = attrs.pop("author_name")
+                if name:
+                    attrs["author_id"] = self.author_ids[name]
+                books.append(Book(**attrs))
+            Book.objects.bulk_create(books)
+            self.report.created += len(books)
+
+
+def _text(record, field):
+    """``record[field]`` stripped, or "" when missing or null."""
+    value = record.get(field)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise serializers.ValidationError(f"{field} must be a string.")
+    return value.strip()
+
+
+def _integer(record, field, message):
+    """``record[field]`` as an int: a JSON integer or a string of digits, never a float or bool."""
+    value = record.get(field)
+    if isinstance(value, str) and re.fullmatch(r"[+-]?[0-9]+", value.strip()):
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise serializers.ValidationError(message)
+
+
+def _first_message(exc):
+    detail = exc.detail
+    while isinstance(detail, (list, dict)):
+        detail = next(iter(detail.values())) if isinstance(detail, dict) else detail[0]
+    return str(detail)
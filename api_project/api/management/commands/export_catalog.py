@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.exchange import EXPORT_FIELDS, FORMATS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Stream the Book or Author table as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORT_FIELDS))
+        parser.add_argument("--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--output", help="File to write (default: standard output)"
+        )
+
+    def handle(self, *args, **options):
+        chunks = iter_export(options["kind"], options["format"])
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as out:
+                out.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -1,4 +1,8 @@
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_cache_version
 
 
 # Create your models here.
@@ -17,3 +21,12 @@ class Book(models.Model):
 
     def __str__(self):
         return self.title
+
+
+# Any write to a book or author makes cached list responses stale (api/caching.py)
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_responses(sender, **kwargs):
+    bump_cache_version(sender)
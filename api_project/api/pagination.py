@@ -0,0 +1,63 @@
+"""
+Bounded list responses.
+
+Every list endpoint is paginated by default (see ``REST_FRAMEWORK`` in
+settings) and no client can ask for more than MAX_PAGE_SIZE rows per page.
+Clients that really need the whole table use a view with StreamingListMixin,
+which writes one JSON array chunk by chunk instead of building it in memory.
+"""
+
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import PageNumberPagination
+
+from .fastread import get_read_plan
+from .renderers import FastJSONRenderer
+
+MAX_PAGE_SIZE = 500
+STREAM_CHUNK_SIZE = 1000
+
+
+class BoundedPageNumberPagination(PageNumberPagination):
+    """``?page=`` plus ``?page_size=``, capped at MAX_PAGE_SIZE."""
+
+    page_size_query_param = "page_size"
+    max_page_size = MAX_PAGE_SIZE
+
+
+class StreamingListMixin:
+    """
+    Serve ``list()`` as one unpaginated JSON array, streamed.
+
+    The filtered queryset is read with ``.iterator()``; each chunk of
+    ``stream_chunk_size`` objects is serialized and rendered before the next
+    one is fetched. Items look exactly like the ``results`` of the paginated
+    endpoint, and go through the serializer's ReadPlan when it has one.
+    """
+
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            FastJSONRenderer().stream(self.iter_chunks(queryset)),
+            content_type="application/json",
+        )
+
+    def iter_chunks(self, queryset):
+        """Yield serialized items, ``stream_chunk_size`` at a time."""
+        plan = get_read_plan(self.get_serializer_class())
+        if plan is not None:
+            queryset = plan.values(queryset)
+        chunk = []
+        for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(obj)
+            if len(chunk) == self.stream_chunk_size:
+                yield self.serialize_chunk(plan, chunk)
+                chunk = []
+        if chunk:
+            yield self.serialize_chunk(plan, chunk)
+
+    def serialize_chunk(self, plan, objects):
+        if plan is not None:
+            return plan.represent(objects)
+        return self.get_serializer(objects, many=True).data
@@ -0,0 +1,62 @@
+"""
+orjson-backed JSON rendering.
+
+FastJSONRenderer is a drop-in replacement for DRF's JSONRenderer, selected
+in ``REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"]``. orjson encodes dicts,
+lists, strings, numbers, UUIDs and datetimes natively in C. Decimals and the
+rest of what DRF's encoder understands (lazy strings, querysets, timedeltas,
+...) go through that encoder's ``default()``. The bytes are the same as
+JSONRenderer's, except that NaN/Infinity become ``null`` instead of raising
+and very large or small floats may spell the exponent differently.
+
+Without orjson installed, and for the cases orjson cannot do (indented
+output, ``ensure_ascii``, integers wider than 64 bits), rendering falls back
+to JSONRenderer.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # Aware UTC datetimes as "...Z", like DRF's encoder; int dict keys as strings
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # JSONRenderer escapes these so the output is also valid JavaScript
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+    def stream(self, chunks):
+        """
+        Yield one JSON array piece by piece, given an iterable of item lists.
+
+        Only one chunk is ever rendered at a time, so a response of any size
+        can be sent through a StreamingHttpResponse.
+        """
+        opening = b"["
+        for items in chunks:
+            if items:
+                # Render the chunk as an array and drop its brackets
+                yield opening + self.render(items)[1:-1]
+                opening = b","
+        yield b"[]" if opening == b"[" else b"]"
@@ -1,3 +1,149 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from .models import Author, Book
+from .pagination import BoundedPageNumberPagination
+from .renderers import FastJSONRenderer
+from .serializers import BookSerializer
+from .views import BookStream
+
+
+class CatalogExchangeTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sync", password="pass")
+        self.client.force_authenticate(user=self.user)
+        self.author = Author.objects.create(name="Octavia E. Butler", bio="Writer")
+        Book.objects.create(title="Kindred", author=self.author)
+
+    def test_export_streams_csv(self):
+        response = self.client.get(reverse("catalog-export", args=["books", "csv"]))
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,title,author_id,author_name")
+        self.assertTrue(lines[1].endswith(f"Kindred,{self.author.pk},Octavia E. Butler"))
+
+    def test_import_resolves_author_names(self):
+        body = "\n".join(
+            [
+                json.dumps({"title": "Dawn", "author_name": "Octavia E. Butler"}),
+                json.dumps({"title": "Lilith's Brood", "author_name": "New Author"}),
+                json.dumps({"author_name": "New Author"}),
+            ]
+        )
+        response = self.client.generic(
+            "POST",
+            reverse("catalog-import", args=["books", "ndjson"]),
+            body,
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(response.data["authors_created"], 1)
+        self.assertEqual(response.data["errors"], [{"line": 3, "error": "title is required."}])
+
+    def test_import_rejects_wrongly_typed_values(self):
+        records = [
+            {"title": 5, "author_name": "X"},
+            {"title": "A", "author_id": True},
+            {"title": "B", "author_id": float(self.author.pk)},
+            {"title": "C", "author_id": str(self.author.pk)},
+        ]
+        response = self.client.generic(
+            "POST",
+            reverse("catalog-import", args=["books", "ndjson"]),
+            "\n".join(json.dumps(r) for r in records),
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(
+            response.data["errors"],
+            [
+                {"line": 1, "error": "title must be a string."},
+                {"line": 2, "error": "author_name or author_id is required."},
+                {"line": 3, "error": "author_name or author_id is required."},
+            ],
+        )
+        self.assertEqual(response.data["created"], 1)
+
+    def test_undecodable_body_is_a_bad_request(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.generic(
+                "POST",
+                reverse("catalog-import", args=["authors", "ndjson"]),
+                json.dumps({"name": "Ann Leckie"}).encode() + b"\n\xff\n",
+                content_type="application/x-ndjson",
+            )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(callbacks), 1)  # cached lists still invalidated
+
+    def test_commands_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "authors.ndjson")
+            call_command("export_catalog", "authors", "--format", "ndjson", "--output", path)
+            Author.objects.all().delete()
+            out = StringIO()
+            call_command("import_catalog", "authors", path, "--format", "ndjson", stdout=out)
+        self.assertIn("Created 1", out.getvalue())
+        self.assertEqual(Author.objects.get().bio, "Writer")
+
+
+class BookListCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", password="pass")
+        self.client.force_authenticate(user=self.user)
+        self.author = Author.objects.create(name="Ursula K. Le Guin", bio="Writer")
+        Book.objects.create(title="The Dispossessed", author=self.author)
+
+    def test_list_served_from_cache_until_a_book_changes(self):
+        for url in (reverse("book-list"), reverse("book_all-list")):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                cached = self.client.get(url)
+            self.assertEqual(cached.content, first.content)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("book_all-list"),
+                {"title": "Lavinia", "author": self.author.pk},
+                format="json",
+            )
+        self.assertEqual(self.client.get(reverse("book-list")).data["count"], 2)
+        self.assertEqual(self.client.get(reverse("book_all-list")).data["count"], 2)
+
+
+class BookPaginationTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(user=User.objects.create_user(username="pager"))
+        author = Author.objects.create(name="Iain M. Banks", bio="Writer")
+        Book.objects.bulk_create(Book(title=f"Culture {i:02}", author=author) for i in range(12))
+
+    def test_lists_are_paged_with_a_capped_page_size(self):
+        with patch.object(BoundedPageNumberPagination, "max_page_size", 5):
+            response = self.client.get(reverse("book_all-list") + "?page_size=100&page=3")
+        self.assertEqual(response.data["count"], 12)
+        self.assertEqual([b["title"] for b in response.data["results"]], ["Culture 10", "Culture 11"])
+
+    def test_read_plan_matches_serializer_output(self):
+        expected = JSONRenderer().render(BookSerializer(Book.objects.order_by("pk"), many=True).data)
+        response = self.client.get(reverse("book_all-list") + "?page_size=20")
+        self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+        self.assertEqual(JSONRenderer().render(response.data["results"]), expected)
+        self.assertEqual(json.loads(response.content)["results"], json.loads(expected))
+
+    def test_stream_returns_every_book(self):
+        with patch.object(BookStream, "stream_chunk_size", 5):
+            response = self.client.get(reverse("book-stream"))
+        self.assertTrue(response.streaming)
+        books = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([b["title"] for b in books], [f"Culture {i:02}" for i in range(12)])
@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BookList, BookViewSet
+from .views import BookList, BookStream, BookViewSet, CatalogExport, CatalogImport
 from rest_framework.authtoken.views import obtain_auth_token
 
 # Create a router and register the BookViewSet
@@ -10,7 +10,12 @@ router.register(r"books_all", BookViewSet, basename="book_all")
 urlpatterns = [
     # Route for the BookList view (ListAPIView)
     path("books/", BookList.as_view(), name="book-list"),
+    # Every book in one streamed JSON array, for clients that need them all
+    path("books/stream/", BookStream.as_view(), name="book-stream"),
     # Include the router URLs for BookViewSet (all CRUD operations)
     path("", include(router.urls)),
     path("get-token/", obtain_auth_token, name="get-token"),
+    # Streamed CSV / NDJSON export and import of books or authors
+    path("export/<str:kind>.<str:fmt>", CatalogExport.as_view(), name="catalog-export"),
+    path("import/<str:kind>.<str:fmt>", CatalogImport.as_view(), name="catalog-import"),
 ]
@@ -1,17 +1,30 @@
+import codecs
+
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 
 # Create your views here.
 #  create a view named BookList that extends rest_framework.generics.ListAPIView.
 from rest_framework import generics
+from .caching import CachedListMixin
+from .exchange import EXPORT_FIELDS, FORMATS, import_stream, iter_export
+from .fastread import ReadPlanListMixin
 from .models import Book
+from .pagination import StreamingListMixin
 from .serializers import BookSerializer
 
 
-class BookList(generics.ListAPIView):
-    queryset = Book.objects.all()
+class BookList(CachedListMixin, ReadPlanListMixin, generics.ListAPIView):
+    queryset = Book.objects.order_by("pk")
     serializer_class = BookSerializer
+    # Rendered JSON is cached per permission scope until a book changes
+    cache_models = (Book,)
 
     # a new class BookViewSet that handles all CRUD operations.
 
@@ -19,8 +32,61 @@ class BookList(generics.ListAPIView):
 from rest_framework import viewsets
 
 
-class BookViewSet(viewsets.ModelViewSet):
-    queryset = Book.objects.all()
+class BookViewSet(CachedListMixin, ReadPlanListMixin, viewsets.ModelViewSet):
+    queryset = Book.objects.order_by("pk")
     serializer_class = BookSerializer
+    # Only list() is cached; writes through this viewset bump the Book version
+    cache_models = (Book,)
     # Only authenticated users with a valid token can access CRUD operations
     permission_classes = [IsAuthenticated]
+
+
+# Opt-in "export all": every book as one JSON array, streamed instead of paged
+class BookStream(StreamingListMixin, BookList):
+    pass
+
+
+# Streamed CSV / NDJSON export and raw-body import of the catalog (see api/exchange.py)
+class _IgnoreAcceptHeader(BaseContentNegotiation):
+    # Export/import bodies are CSV or NDJSON whatever the Accept header says
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+# Batches before the bad bytes are already committed; say so
+_UNDECODABLE_BODY = "Request body is not valid UTF-8; rows before the error may have been imported."
+
+
+def _check_kind_and_format(kind, fmt):
+    if kind not in EXPORT_FIELDS or fmt not in FORMATS:
+        raise NotFound("Use books or authors, as csv or ndjson.")
+
+
+class CatalogExport(APIView):
+    # GET export/<books|authors>.<csv|ndjson>: the whole table, streamed
+    content_negotiation_class = _IgnoreAcceptHeader
+
+    def get(self, request, kind, fmt):
+        _check_kind_and_format(kind, fmt)
+        response = StreamingHttpResponse(iter_export(kind, fmt), content_type=FORMATS[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+
+class CatalogImport(APIView):
+    # POST import/<books|authors>.<csv|ndjson> with the file as the raw body
+    content_negotiation_class = _IgnoreAcceptHeader
+
+    def post(self, request, kind, fmt):
+        _check_kind_and_format(kind, fmt)
+        if request.stream is None:
+            raise ParseError("Empty request body.")
+        # Read the body line by line rather than through request.data
+        try:
+            report = import_stream(kind, fmt, codecs.iterdecode(request.stream, "utf-8"))
+        except UnicodeDecodeError:
+            raise ParseError(_UNDECODABLE_BODY)
+        return Response(report)
@@ -123,6 +123,16 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Cached list responses (api/caching.py); use a shared backend such as Redis
+# or Memcached when running more than one process
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-project",
+    }
+}
+
 DEFAULT_AUTHENTICATION_CLASSES = [
     "rest_framework.authentication.TokenAuthentication",
 ]
@@ -133,4 +143,12 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # Every list is paged; ?page_size= is capped by api.pagination.MAX_PAGE_SIZE
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.BoundedPageNumberPagination",
+    "PAGE_SIZE": 50,
+    # orjson-backed JSON (see api.renderers), plus the browsable API
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
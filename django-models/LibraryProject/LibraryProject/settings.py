@@ -82,6 +82,25 @@ DATABASES = {
 }
 
 
+# Cache (per-process; use a shared backend such as Redis in production so
+# every worker sees permission changes)
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "libraryproject",
+    }
+}
+
+
+# Authentication backends
+# ModelBackend with a cross-request permission cache
+# (see relationship_app/permissions.py)
+
+AUTHENTICATION_BACKENDS = ["relationship_app.backends.CachedModelBackend"]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
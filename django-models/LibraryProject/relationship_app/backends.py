@@ -0,0 +1,35 @@
+from django.contrib.auth.backends import ModelBackend, UserModel
+
+from .permissions import cached_permissions
+from .roles import get_role
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose permission checks cost one cache read and no queries
+    while permissions are unchanged (see ``relationship_app.permissions``).
+
+    Users it loads for the authentication middleware carry their ``role``,
+    read from the profile in the same query as the user.
+    """
+
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related("userprofile").get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        if not self.user_can_authenticate(user):
+            return None
+        get_role(user)
+        return user
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            user_obj._perm_cache = cached_permissions(
+                user_obj, super().get_all_permissions
+            )
+        return user_obj._perm_cache
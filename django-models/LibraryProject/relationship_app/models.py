@@ -1,8 +1,11 @@
 from django.db import models
-from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
+from .permissions import bump_permissions_version
+from .roles import forget_role
+
 
 class Author(models.Model):
     name = models.CharField(max_length=100)
@@ -67,3 +70,26 @@ def create_user_profile(sender, instance, created, **kwargs):
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
     instance.userprofile.save()
+
+
+# Invalidate cached permission sets (see relationship_app.permissions)
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def permissions_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_permissions_version()
+
+
+# Deleting a group or permission drops its M2M rows without m2m_changed;
+# migrations create permissions that superusers hold implicitly
+post_delete.connect(bump_permissions_version, sender=Group)
+post_delete.connect(bump_permissions_version, sender=Permission)
+post_migrate.connect(
+    bump_permissions_version, dispatch_uid="relationship_app_permissions_version"
+)
+
+
+# Drop cached roles (see relationship_app.roles)
+post_save.connect(forget_role, sender=UserProfile)
+post_delete.connect(forget_role, sender=UserProfile)
@@ -0,0 +1,55 @@
+"""
+Role lookups for role-gated views.
+
+A user's role lives on UserProfile, one query away from the user. Users
+loaded by the authentication middleware come with their profile joined in
+(see ``CachedModelBackend.get_user``) and carry ``role`` already. Users loaded
+any other way, such as by a token or API authentication class, are resolved
+once and then read from the cache. Saving or deleting a profile drops the
+cached role (see the receivers in ``relationship_app.models``).
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+_UNKNOWN = object()
+
+
+def _role_key(user_id):
+    return f"auth:role:{user_id}"
+
+
+def get_role(user):
+    """``user``'s role name, or None for anonymous users and users without a profile."""
+    if not user.is_authenticated:
+        return None
+    role = getattr(user, "role", _UNKNOWN)
+    if role is not _UNKNOWN:
+        return role
+    # __class__ rather than type(): request.user is a lazy proxy
+    profile = user.__class__.userprofile.related.get_cached_value(user, None)
+    if profile is not None:
+        role = profile.role
+    else:
+        # Cached as "" for users without a profile, so they are not re-queried
+        role = cache.get(_role_key(user.pk))
+        if role is None:
+            from .models import UserProfile
+
+            role = (
+                UserProfile.objects.filter(user_id=user.pk)
+                .values_list("role", flat=True)
+                .first()
+            ) or ""
+            cache.set(_role_key(user.pk), role, ROLE_CACHE_TIMEOUT)
+        role = role or None
+    user.role = role
+    return role
+
+
+def forget_role(sender, instance, **kwargs):
+    """Drop the cached role of a profile's user; a UserProfile signal receiver."""
+    user_id = instance.user_id
+    transaction.on_commit(lambda: cache.delete(_role_key(user_id)))
@@ -1,3 +1,133 @@
-from django.test import TestCase
+from django.contrib.auth import get_user
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db import transaction
+from django.test import RequestFactory, TestCase
 
-# Create your tests here.
+from .models import UserProfile
+from .permissions import PERMISSIONS_VERSION_KEY
+from .roles import get_role
+
+PERM = "relationship_app.view_book"
+
+
+class CachedPermissionsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("reader", password="pass12345")
+        self.group = Group.objects.create(name="Librarians")
+        self.permission = Permission.objects.get(
+            content_type__app_label="relationship_app", codename="view_book"
+        )
+
+    def fresh_user(self):
+        # A new instance, like the one each request gets
+        return User.objects.get(pk=self.user.pk)
+
+    def test_steady_state_costs_no_queries(self):
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertFalse(user.has_perm(PERM))
+            self.assertEqual(user.get_all_permissions(), set())
+
+    def test_group_permission_change_invalidates(self):
+        self.user.groups.add(self.group)
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(self.permission)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+
+    def test_user_permission_change_invalidates(self):
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.permission)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.remove(self.permission)
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_reverse_side_changes_invalidate(self):
+        self.group.permissions.add(self.permission)
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.user_set.add(self.user)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.permission.group_set.remove(self.group)
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_deleting_a_group_invalidates(self):
+        self.group.permissions.add(self.permission)
+        self.user.groups.add(self.group)
+        self.assertTrue(self.fresh_user().has_perm(PERM))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.delete()
+        self.assertFalse(self.fresh_user().has_perm(PERM))
+
+    def test_rolled_back_change_keeps_the_version(self):
+        self.fresh_user().has_perm(PERM)
+        version = cache.get(PERMISSIONS_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.user.user_permissions.add(self.permission)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertEqual(callbacks, [])
+        self.assertEqual(cache.get(PERMISSIONS_VERSION_KEY), version)
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertFalse(user.has_perm(PERM))
+
+
+class RoleLookupTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("reader", password="pass12345")
+        self.client.force_login(self.user)
+
+    def request_user(self):
+        request = RequestFactory().get("/")
+        request.session = self.client.session
+        return get_user(request)
+
+    def set_role(self, role):
+        profile = UserProfile.objects.get(user=self.user)
+        profile.role = role
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+
+    def test_session_user_comes_with_its_role_in_one_query(self):
+        request = RequestFactory().get("/")
+        request.session = self.client.session
+        # Read the session up front: only the user lookup is being counted
+        request.session.items()
+        with self.assertNumQueries(1):
+            user = get_user(request)
+            self.assertEqual(user.role, "Member")
+            self.assertEqual(get_role(user), "Member")
+
+    def test_role_change_is_seen_on_the_next_request(self):
+        self.assertEqual(self.request_user().role, "Member")
+        self.set_role("Librarian")
+        self.assertEqual(self.request_user().role, "Librarian")
+
+    def test_role_of_user_loaded_without_profile_is_cached(self):
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_role(user), "Member")
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role(user), "Member")
+
+    def test_profile_save_and_delete_clear_the_cached_role(self):
+        get_role(User.objects.get(pk=self.user.pk))
+        self.set_role("Admin")
+        self.assertEqual(get_role(User.objects.get(pk=self.user.pk)), "Admin")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.filter(user=self.user).delete()
+        self.assertIsNone(get_role(User.objects.get(pk=self.user.pk)))
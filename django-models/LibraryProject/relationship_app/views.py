@@ -9,6 +9,7 @@ from django.http import HttpResponseForbidden
 from django.urls import reverse_lazy
 from .models import Library, Book
 from .models import Relationship  # Make sure this import exists
+from .roles import get_role
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
 
@@ -195,12 +196,8 @@ class RelationshipDeleteView(DeleteView):
 
 # Role-based access control function
 def check_role(user, role_name):
-    """Check if user has the specified role"""
-    return (
-        user.is_authenticated
-        and hasattr(user, "userprofile")
-        and user.userprofile.role == role_name
-    )
+    """Check if user has the specified role (no query for logged-in users)"""
+    return get_role(user) == role_name
 
 
 # Role-based views with explicit user_passes_test usage
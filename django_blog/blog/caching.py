@@ -0,0 +1,124 @@
+import hashlib
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date
+
+from .models import Post
+
+# ==================== CONTENT FINGERPRINTS ====================
+
+
+def content_fingerprint(*querysets):
+    """
+    Summarise the rows a page renders with one aggregate query per queryset.
+
+    Each queryset contributes its newest ``updated_at`` (or of each column in
+    the model's ``fingerprint_fields``) and its row count, so edits, inserts
+    and deletes all change the fingerprint.
+
+    Returns:
+        tuple: (last_modified datetime or None, token string)
+    """
+    last_modified = None
+    parts = []
+    for queryset in querysets:
+        fields = getattr(queryset.model, "fingerprint_fields", ("updated_at",))
+        stats = queryset.order_by().aggregate(
+            *[Max(field) for field in fields], total=Count("pk", distinct=True)
+        )
+        for field in fields:
+            latest = stats[f"{field}__max"]
+            if latest is not None and (last_modified is None or latest > last_modified):
+                last_modified = latest
+            parts.append(latest.isoformat() if latest else "-")
+        parts.append(str(stats["total"]))
+    return last_modified, "|".join(parts)
+
+
+def conditional_validators(request, querysets):
+    """
+    Build response validators for ``request`` over the rows in ``querysets``.
+
+    Returns:
+        tuple: (hex digest for cache keys, quoted ETag, Last-Modified timestamp
+        or None)
+    """
+    last_modified, token = content_fingerprint(*querysets)
+    digest = hashlib.md5(f"{request.get_full_path()}|{token}".encode()).hexdigest()
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return digest, f'"{digest}"', timestamp
+
+
+# ==================== ANONYMOUS PAGE CACHE ====================
+
+
+class AnonymousPageCacheMixin:
+    """
+    Conditional GET and full-page caching for anonymous visitors.
+
+    Anonymous GET/HEAD requests get strong ETag and Last-Modified validators
+    derived from ``get_fingerprint_querysets()``; a matching
+    If-None-Match/If-Modified-Since returns 304 without touching the template.
+    Otherwise the rendered page is cached under a key that embeds the ETag,
+    so any content write produces a new key and stale pages are never served.
+
+    Logged-in users, and visitors with pending flash messages, always get a
+    fresh render.
+    """
+
+    page_cache_timeout = 60 * 15
+    page_cache_prefix = "blog:page"
+
+    def get_fingerprint_querysets(self):
+        """Querysets whose rows this page renders. Override per view."""
+        return [Post.objects.all()]
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.page_is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        digest, etag, timestamp = conditional_validators(
+            request, self.get_fingerprint_querysets()
+        )
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            cache_key = f"{self.page_cache_prefix}:{digest}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = super().dispatch(request, *args, **kwargs)
+                if hasattr(response, "render"):
+                    response.render()
+                if response.status_code != 200:
+                    return response
+                cache.set(
+                    cache_key,
+                    (response.content, response["Content-Type"]),
+                    self.page_cache_timeout,
+                )
+
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ["Cookie"])
+        return response
+
+    def page_is_cacheable(self, request):
+        """Only anonymous GET/HEAD requests without queued messages are cached."""
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if request.user.is_authenticated:
+            return False
+        return not len(get_messages(request))
@@ -0,0 +1,262 @@
+"""
+RSS, Atom and JSON Feed syndication for blog posts.
+
+Like most syndication feeds they carry only the latest FEED_ITEM_LIMIT posts.
+Feeds are streamed: posts are read with a chunked ``.iterator()`` over the
+few columns a feed entry needs and each entry is serialised as soon as it is
+fetched. Responses
+carry the same ETag/Last-Modified validators as the cached HTML pages, and
+feeds small enough to keep are cached as rendered text under a key that
+changes with the content.
+"""
+
+import json
+from datetime import datetime, timezone
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed, SyndicationFeed
+from django.utils.http import http_date
+from django.utils.xmlutils import SimplerXMLGenerator
+from django.views import View
+
+from .caching import conditional_validators
+from .models import Post, Tag
+
+FEED_ITEM_LIMIT = 50
+FEED_CHUNK_SIZE = 200
+FEED_CACHE_TIMEOUT = 60 * 15
+# Feeds larger than this are streamed on every request instead of cached
+FEED_CACHE_MAX_CHARS = 1024 * 1024
+
+
+# ==================== STREAMING GENERATORS ====================
+
+
+class StreamingFeedMixin:
+    """
+    Serialise a Django feed generator one item at a time.
+
+    The stock generators build ``self.items`` up front and write the whole
+    document in one go. Here the document is first written with no items and
+    split at ``closing_tag``; entries are then written between the two halves
+    as ``item_kwargs`` arrive.
+    """
+
+    closing_tag = None
+
+    def __init__(self, *args, latest_date=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.latest_date = latest_date
+
+    def latest_post_date(self):
+        # The stock version scans self.items, which is never populated here
+        return self.latest_date or super().latest_post_date()
+
+    def stream(self, item_kwargs):
+        self.items = []
+        head, tail = self.writeString("utf-8").rsplit(self.closing_tag, 1)
+        yield head
+
+        buffer = StringIO()
+        handler = SimplerXMLGenerator(buffer, "utf-8", short_empty_elements=True)
+        for kwargs in item_kwargs:
+            self.items = []
+            self.add_item(**kwargs)
+            self.write_items(handler)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        self.items = []
+        yield self.closing_tag + tail
+
+
+class StreamingRssFeed(StreamingFeedMixin, Rss201rev2Feed):
+    closing_tag = "</channel>"
+
+
+class StreamingAtomFeed(StreamingFeedMixin, Atom1Feed):
+    closing_tag = "</feed>"
+
+
+class StreamingJsonFeed(StreamingFeedMixin, SyndicationFeed):
+    """JSON Feed 1.1 (https://jsonfeed.org/version/1.1)."""
+
+    content_type = "application/feed+json; charset=utf-8"
+
+    def write(self, outfile, encoding):
+        for chunk in self.stream(self.items):
+            outfile.write(chunk)
+
+    def stream(self, item_kwargs):
+        header = {
+            "version": "https://jsonfeed.org/version/1.1",
+            "title": self.feed["title"],
+            "home_page_url": self.feed["link"],
+            "feed_url": self.feed["feed_url"],
+            "description": self.feed["description"],
+            "language": self.feed["language"],
+        }
+        yield json.dumps(header)[:-1] + ', "items": ['
+
+        separator = ""
+        for kwargs in item_kwargs:
+            self.items = []
+            self.add_item(**kwargs)
+            yield separator + json.dumps(self.item_to_json(self.items[0]))
+            separator = ", "
+        self.items = []
+        yield "]}"
+
+    def item_to_json(self, item):
+        entry = {
+            "id": item["unique_id"] or item["link"],
+            "url": item["link"],
+            "title": item["title"],
+            "content_text": item["description"],
+        }
+        if item["pubdate"]:
+            entry["date_published"] = item["pubdate"].isoformat()
+        if item["updateddate"]:
+            entry["date_modified"] = item["updateddate"].isoformat()
+        if item["author_name"]:
+            entry["authors"] = [{"name": item["author_name"]}]
+        if item["categories"]:
+            entry["tags"] = list(item["categories"])
+        return entry
+
+
+FEED_GENERATORS = {
+    "rss": StreamingRssFeed,
+    "atom": StreamingAtomFeed,
+    "json": StreamingJsonFeed,
+}
+
+
+# ==================== FEED VIEWS ====================
+
+
+class PostFeedView(View):
+    """The latest posts, newest first, as RSS, Atom or JSON Feed."""
+
+    feed_title = "Django Blog"
+    feed_limit = FEED_ITEM_LIMIT
+    feed_description = "Latest posts from Django Blog"
+    cache_prefix = "blog:feed"
+
+    def get_posts(self):
+        return Post.objects.all()
+
+    def get_feed_title(self):
+        return self.feed_title
+
+    def get(self, request, feed_format, **kwargs):
+        generator_class = FEED_GENERATORS.get(feed_format)
+        if generator_class is None:
+            raise Http404("Unknown feed format")
+
+        posts = self.get_posts()
+        digest, etag, timestamp = conditional_validators(request, [posts])
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            cache_key = f"{self.cache_prefix}:{digest}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                response = HttpResponse(cached, content_type=generator_class.content_type)
+            else:
+                latest = (
+                    datetime.fromtimestamp(timestamp, tz=timezone.utc)
+                    if timestamp is not None
+                    else None
+                )
+                feed = generator_class(
+                    title=self.get_feed_title(),
+                    link=request.build_absolute_uri(reverse("post-list")),
+                    description=self.feed_description,
+                    language=settings.LANGUAGE_CODE,
+                    feed_url=request.build_absolute_uri(),
+                    latest_date=latest,
+                )
+                chunks = feed.stream(self.iter_items(posts))
+                response = StreamingHttpResponse(
+                    self.cache_stream(cache_key, chunks),
+                    content_type=generator_class.content_type,
+                )
+
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ["Accept-Encoding"])
+        return response
+
+    def iter_items(self, posts):
+        """Yield add_item() keyword arguments for the newest ``feed_limit`` posts."""
+        posts = (
+            posts.select_related("author")
+            .prefetch_related(Prefetch("tags", queryset=Tag.objects.only("name")))
+            .only("title", "content", "published_date", "updated_at", "author__username")
+            .order_by("-published_date", "-pk")[: self.feed_limit]
+        )
+        for post in posts.iterator(chunk_size=FEED_CHUNK_SIZE):
+            link = self.request.build_absolute_uri(
+                reverse("post-detail", args=[post.pk])
+            )
+            yield {
+                "title": post.title,
+                "link": link,
+                "description": post.content,
+                "author_name": post.author.username,
+                "pubdate": post.published_date,
+                "updateddate": post.updated_at,
+                "unique_id": link,
+                "unique_id_is_permalink": True,
+                "categories": [tag.name for tag in post.tags.all()],
+            }
+
+    def cache_stream(self, cache_key, chunks):
+        """Pass chunks through, caching the whole feed if it stays small."""
+        kept, size = [], 0
+        for chunk in chunks:
+            if kept is not None:
+                size += len(chunk)
+                if size > FEED_CACHE_MAX_CHARS:
+                    kept = None
+                else:
+                    kept.append(chunk)
+            yield chunk
+        if kept is not None:
+            cache.set(cache_key, "".join(kept), FEED_CACHE_TIMEOUT)
+
+
+class AuthorFeedView(PostFeedView):
+    """Posts by one author."""
+
+    def get_posts(self):
+        self.author = get_object_or_404(User, username=self.kwargs["username"])
+        return Post.objects.filter(author=self.author)
+
+    def get_feed_title(self):
+        return f"{self.feed_title}: posts by {self.author.username}"
+
+
+class TagFeedView(PostFeedView):
+    """Posts carrying one tag."""
+
+    def get_posts(self):
+        self.tag = get_object_or_404(Tag, slug=self.kwargs["tag_slug"])
+        return Post.objects.filter(tags=self.tag)
+
+    def get_feed_title(self):
+        return f"{self.feed_title}: posts tagged {self.tag.name}"
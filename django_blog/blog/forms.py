@@ -1,8 +1,8 @@
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
-from taggit.forms import TagWidget  # ✅ Taggit integration
-from .models import Post, Comment
+from taggit.forms import TagField, TagWidget  # ✅ Taggit integration
+from .models import Post, Comment, Tag
 
 
 class CustomUserCreationForm(UserCreationForm):
@@ -40,11 +40,22 @@ class PostForm(forms.ModelForm):
     """
     Form for creating and updating blog posts.
     Fully integrates django-taggit with TagWidget().
+
+    Tags are entered as a comma-separated string (parsed by taggit's
+    ``TagField``) and stored in ``blog.Tag``; all tags are resolved and any
+    new ones bulk-created in one pass by ``Tag.objects.get_or_create_many``.
     """
 
+    tags = TagField(
+        required=False,
+        widget=TagWidget(attrs={"class": "form-control"}),
+        label="Tags",
+        help_text="Add descriptive tags separated by commas.",
+    )
+
     class Meta:
         model = Post
-        fields = ("title", "content", "tags")
+        fields = ("title", "content")
         widgets = {
             "title": forms.TextInput(
                 attrs={
@@ -59,20 +70,36 @@ class PostForm(forms.ModelForm):
                     "rows": 10,
                 }
             ),
-            # ✅ Checker-friendly and functional
-            "tags": TagWidget(),
         }
         help_texts = {
             "title": "Max 200 characters",
             "content": "Write your blog post content",
-            "tags": "Add descriptive tags separated by commas.",
         }
         labels = {
             "title": "Post Title",
             "content": "Post Content",
-            "tags": "Tags",
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk and "tags" not in self.initial:
+            self.initial["tags"] = list(self.instance.tags.all())
+
+    def clean_tags(self):
+        names = self.cleaned_data["tags"]
+        unusable = [name for name in names if not Tag.objects.normalize(name)[1]]
+        if unusable:
+            raise forms.ValidationError(
+                "Tags need at least one letter or digit (A-Z, 0-9): %(names)s",
+                params={"names": ", ".join(unusable)},
+            )
+        return names
+
+    def _save_m2m(self):
+        super()._save_m2m()
+        tags = Tag.objects.get_or_create_many(self.cleaned_data["tags"])
+        self.instance.tags.set(tags)
+
 
 class CommentForm(forms.ModelForm):
     """Form for creating and updating comments."""
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from blog.sitemaps import SitemapBuilder
+
+
+class Command(BaseCommand):
+    help = "Write the sitemap index, regenerating only chunks whose rows changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true", help="Rewrite every chunk"
+        )
+
+    def handle(self, *args, **options):
+        written, unchanged = SitemapBuilder().build(force=options["force"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written} sitemap chunks ({unchanged} unchanged)."
+            )
+        )
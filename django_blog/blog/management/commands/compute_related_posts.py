@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from blog.models import Post, RelatedPost
+from blog.related import top_related
+
+
+class Command(BaseCommand):
+    help = "Precompute the top-K related posts (tag-overlap Jaccard) for every post"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top-k", type=int, default=5, help="Related posts kept per post"
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Posts scored per vectorised batch",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000, help="Rows per bulk insert"
+        )
+
+    def handle(self, *args, **options):
+        # One streaming read of the post x tag incidence table
+        pairs = Post.tags.through.objects.values_list("post_id", "tag_id")
+        post_ids, tag_ids = [], []
+        for post_id, tag_id in pairs.iterator(chunk_size=5000):
+            post_ids.append(post_id)
+            tag_ids.append(tag_id)
+
+        batch_size = options["batch_size"]
+        written = 0
+        with transaction.atomic():
+            RelatedPost.objects.all().delete()
+            batch = []
+            for post_id, matches in top_related(
+                post_ids,
+                tag_ids,
+                top_k=options["top_k"],
+                chunk_size=options["chunk_size"],
+            ):
+                batch.extend(
+                    RelatedPost(
+                        post_id=post_id, related_id=related_id, rank=rank, score=score
+                    )
+                    for rank, (related_id, score) in enumerate(matches)
+                )
+                if len(batch) >= batch_size:
+                    RelatedPost.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                RelatedPost.objects.bulk_create(batch)
+                written += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Stored {written} related-post rows."))
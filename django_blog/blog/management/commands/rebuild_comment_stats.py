@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Recompute Post.comment_count and Post.last_comment_at in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Posts recomputed per batch"
+        )
+
+    def handle(self, *args, **options):
+        total = Post.objects.rebuild_comment_stats(batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt comment stats for {total} posts.")
+        )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from blog.models import Tag
+
+
+class Command(BaseCommand):
+    help = "Recompute Tag.post_count from the Post.tags join table"
+
+    def handle(self, *args, **kwargs):
+        total = Tag.objects.rebuild_counts()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {total} tags."))
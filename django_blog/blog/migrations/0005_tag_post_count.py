@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:03
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_post_counts(apps, schema_editor):
+    Tag = apps.get_model("blog", "Tag")
+    Through = apps.get_model("blog", "Post").tags.through
+    counts = (
+        Through.objects.values("tag_id")
+        .annotate(total=Count("post_id"))
+        .values_list("tag_id", "total")
+    )
+    for tag_id, total in counts:
+        Tag.objects.filter(pk=tag_id).update(post_count=total)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_post_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="tag",
+            index=models.Index(
+                fields=["-post_count", "name"], name="blog_tag_post_co_98a14a_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_post_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:08
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def backfill_comment_stats(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    stats = Comment.objects.values("post_id").annotate(
+        total=Count("pk"), latest=Max("created_at")
+    )
+    for row in stats:
+        Post.objects.filter(pk=row["post_id"]).update(
+            comment_count=row["total"], last_comment_at=row["latest"]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_comment_keyset_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="last_comment_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-comment_count", "-published_date"],
+                name="blog_post_comment_0874cf_idx",
+            ),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 10:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0008_post_comment_stats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-published_date", "-id"], name="blog_post_publish_cfec40_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-published_date", "-id"],
+                name="blog_post_author__f162a0_idx",
+            ),
+        ),
+    ]
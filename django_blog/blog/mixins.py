@@ -0,0 +1,33 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+
+
+class CachedObjectMixin:
+    """
+    Memoize ``get_object()`` for the lifetime of one request.
+
+    Generic edit views call ``get_object()`` from ``get()``/``post()``, and
+    permission checks or custom handlers often call it again; with this mixin
+    only the first call reaches the database.
+    """
+
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, "_cached_object"):
+            self._cached_object = super().get_object()
+        return self._cached_object
+
+
+class OwnerRequiredMixin(LoginRequiredMixin, CachedObjectMixin):
+    """
+    Restrict a detail/edit view to objects owned by the requesting user.
+
+    Ownership is part of the queryset (``filter(author=request.user)``), so a
+    single SELECT both authorizes and fetches the object; objects owned by
+    someone else are reported as 404 rather than loaded and then rejected.
+    """
+
+    owner_field = "author"
+
+    def get_queryset(self):
+        return super().get_queryset().filter(**{self.owner_field: self.request.user})
@@ -1,14 +1,81 @@
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
+from django.utils import timezone
 from django.utils.text import slugify
 
 
+class TagManager(models.Manager):
+    def normalize(self, name):
+        """
+        The (name, slug) a tag entered as ``name`` is stored under, both cut
+        to their column lengths. The slug is "" for names with no ASCII
+        letters or digits, which cannot be tags; see PostForm.clean_tags.
+        """
+        name = name.strip()[: self.model._meta.get_field("name").max_length].strip()
+        slug = slugify(name)[: self.model._meta.get_field("slug").max_length].strip("-_")
+        return name, slug
+
+    def get_or_create_many(self, names):
+        """
+        Resolve tag names to Tag rows with one lookup, bulk-creating any that
+        are missing. Names are matched on their slug, so "Django" and
+        "django" resolve to the same tag; names without a slug are skipped.
+        """
+        by_slug = {}
+        for name in names:
+            name, slug = self.normalize(name)
+            if slug and slug not in by_slug:
+                by_slug[slug] = name
+
+        tags = {tag.slug: tag for tag in self.filter(slug__in=by_slug)}
+        missing = [
+            self.model(name=name, slug=slug)
+            for slug, name in by_slug.items()
+            if slug not in tags
+        ]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            tags = {tag.slug: tag for tag in self.filter(slug__in=by_slug)}
+        return [tags[slug] for slug in by_slug if slug in tags]
+
+    def popular(self, limit=20):
+        """Tag cloud served from the precomputed post_count column."""
+        return self.filter(post_count__gt=0).order_by("-post_count", "name")[:limit]
+
+    def rebuild_counts(self):
+        """Recompute every post_count with a single GROUP BY over the M2M table."""
+        counts = dict(
+            Post.tags.through.objects.values("tag_id")
+            .annotate(total=Count("post_id"))
+            .values_list("tag_id", "total")
+        )
+        now = timezone.now()
+        tags = list(self.only("pk", "post_count"))
+        for tag in tags:
+            tag.post_count = counts.get(tag.pk, 0)
+            tag.updated_at = now
+        self.bulk_update(tags, ["post_count", "updated_at"], batch_size=500)
+        return len(tags)
+
+
 class Tag(models.Model):
     name = models.CharField(max_length=50, unique=True)
     slug = models.SlugField(max_length=60, unique=True, blank=True)
+    # Maintained by the m2m_changed / pre_delete receivers below
+    post_count = models.PositiveIntegerField(default=0, editable=False)
+    # Moves with post_count too, so the tag cloud can be fingerprinted
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = TagManager()
 
     class Meta:
         ordering = ["name"]
+        indexes = [models.Index(fields=["-post_count", "name"])]
 
     def __str__(self):
         return self.name
@@ -20,20 +87,129 @@ class Tag(models.Model):
         super().save(*args, **kwargs)
 
 
+def month_counts_cache_key(author_id=None):
+    return f"blog:archive:months:{author_id or 'all'}"
+
+
+class PostManager(models.Manager):
+    def month_counts(self, author_id=None):
+        """
+        [(first-of-month datetime, post count), ...] newest first, for archive
+        navigation. Cached until a post is created or deleted (published_date
+        itself never changes); see invalidate_month_counts below.
+        """
+        key = month_counts_cache_key(author_id)
+        months = cache.get(key)
+        if months is None:
+            posts = self.all()
+            if author_id is not None:
+                posts = posts.filter(author_id=author_id)
+            months = list(
+                posts.annotate(month=TruncMonth("published_date"))
+                .values("month")
+                .annotate(total=Count("pk"))
+                .values_list("month", "total")
+                .order_by("-month")
+            )
+            cache.set(key, months, None)
+        return months
+
+    def record_comment_added(self, post_pk, created_at):
+        """Bump the denormalized comment stats in a single UPDATE."""
+        return self.filter(pk=post_pk).update(
+            comment_count=F("comment_count") + 1,
+            last_comment_at=created_at,
+            comments_changed_at=timezone.now(),
+        )
+
+    def record_comment_removed(self, post_pk):
+        """
+        Re-derive comment_count and last_comment_at in one UPDATE. Counted
+        rather than decremented, so comments added outside the views (admin,
+        shell) cannot drive the count below zero.
+        """
+        comments = Comment.objects.filter(post=OuterRef("pk")).order_by()
+        total = comments.values("post").annotate(total=Count("pk")).values("total")
+        latest = comments.order_by("-created_at").values("created_at")[:1]
+        return self.filter(pk=post_pk).update(
+            comment_count=Coalesce(Subquery(total), 0),
+            last_comment_at=Subquery(latest),
+            comments_changed_at=timezone.now(),
+        )
+
+    def rebuild_comment_stats(self, batch_size=500):
+        """
+        Recompute comment_count/last_comment_at for every post, batch_size
+        posts at a time (one GROUP BY and one bulk UPDATE per batch).
+        """
+        rebuilt = 0
+        last_pk = 0
+        while True:
+            posts = list(
+                self.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", "comment_count", "last_comment_at", "comments_changed_at")[
+                    :batch_size
+                ]
+            )
+            if not posts:
+                return rebuilt
+            stats = {
+                row["post_id"]: row
+                for row in Comment.objects.filter(post__in=posts)
+                .values("post_id")
+                .annotate(total=Count("pk"), latest=Max("created_at"))
+            }
+            now = timezone.now()
+            for post in posts:
+                row = stats.get(post.pk)
+                post.comment_count = row["total"] if row else 0
+                post.last_comment_at = row["latest"] if row else None
+                post.comments_changed_at = now
+            self.bulk_update(
+                posts, ["comment_count", "last_comment_at", "comments_changed_at"]
+            )
+            rebuilt += len(posts)
+            last_pk = posts[-1].pk
+
+
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
+    # Denormalized from Comment; see PostManager.record_comment_added/removed
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_comment_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # When the comment stats above last moved. Kept apart from updated_at,
+    # which means "post edited" (feeds publish it), but part of the page
+    # validators since post cards render the stats.
+    comments_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
     tags = models.ManyToManyField(
         Tag, blank=True, related_name="posts"
     )  # <— Added field
 
+    objects = PostManager()
+
+    # Columns whose Max() feeds blog.caching.content_fingerprint
+    fingerprint_fields = ("updated_at", "comments_changed_at")
+
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ["-published_date"]
+        indexes = [
+            # Max(updated_at) drives the conditional-GET validators in blog.caching
+            models.Index(fields=["updated_at"]),
+            models.Index(fields=["comments_changed_at"]),
+            # "Most discussed" ordering on PostListView
+            models.Index(fields=["-comment_count", "-published_date"]),
+            # Keyset pages of the date and author archives (blog.views.post_page)
+            models.Index(fields=["-published_date", "-id"]),
+            models.Index(fields=["author", "-published_date", "-id"]),
+        ]
 
 
 class Comment(models.Model):
@@ -47,4 +223,96 @@ class Comment(models.Model):
         return f"Comment by {self.author.username} on {self.post.title}"
 
     class Meta:
-        ordering = ["created_at"]
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["post", "updated_at"]),
+            # Keyset pagination of a post's thread, see blog.views.comment_page
+            models.Index(fields=["post", "created_at", "id"]),
+        ]
+
+
+
+class RelatedPost(models.Model):
+    """
+    Precomputed top-K tag-overlap (Jaccard) neighbours of a post.
+    Rebuilt offline by the ``compute_related_posts`` management command.
+    """
+
+    post = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name="related_entries"
+    )
+    related = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.post_id} -> {self.related_id} ({self.score:.2f})"
+
+    class Meta:
+        ordering = ["post", "rank"]
+        # Serves the single "related posts for post X" lookup
+        unique_together = ["post", "rank"]
+
+# --- Signals keeping Tag.post_count in step with Post.tags ---
+def _shift_tag_counts(tag_ids, delta):
+    if tag_ids:
+        Tag.objects.filter(pk__in=tag_ids).update(
+            post_count=F("post_count") + delta, updated_at=timezone.now()
+        )
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        # pk_set is not provided for clear(), so capture the tags beforehand
+        if not reverse:
+            instance._cleared_tag_ids = list(instance.tags.values_list("pk", flat=True))
+        return
+
+    if action == "pre_remove":
+        # remove() passes every pk it was given, linked or not; keep only the
+        # links that really go away
+        if reverse:
+            links = sender.objects.filter(tag=instance, post_id__in=pk_set)
+            column = "post_id"
+        else:
+            links = sender.objects.filter(post=instance, tag_id__in=pk_set)
+            column = "tag_id"
+        instance._removed_ids = set(links.values_list(column, flat=True))
+        return
+
+    if action in ("post_add", "post_remove"):
+        # add() already leaves out existing links
+        if action == "post_add":
+            delta, ids = 1, pk_set
+        else:
+            delta, ids = -1, instance.__dict__.pop("_removed_ids", set())
+        if reverse:
+            if ids:
+                _shift_tag_counts([instance.pk], delta * len(ids))
+        else:
+            _shift_tag_counts(ids, delta)
+    elif action == "post_clear":
+        if reverse:
+            Tag.objects.filter(pk=instance.pk).update(
+                post_count=0, updated_at=timezone.now()
+            )
+        else:
+            _shift_tag_counts(instance.__dict__.pop("_cleared_tag_ids", []), -1)
+
+
+@receiver(pre_delete, sender=Post)
+def release_tag_counts(sender, instance, **kwargs):
+    # Cascade deletes of the through rows do not send m2m_changed
+    _shift_tag_counts(list(instance.tags.values_list("pk", flat=True)), -1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_month_counts(sender, instance, created=True, **kwargs):
+    # Edits leave published_date alone, so only inserts and deletes matter
+    if created:
+        cache.delete_many(
+            [month_counts_cache_key(), month_counts_cache_key(instance.author_id)]
+        )
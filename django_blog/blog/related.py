@@ -0,0 +1,85 @@
+"""
+Tag-overlap similarity between posts.
+
+Posts and tags form a sparse post x tag incidence matrix. The Jaccard
+similarity of two posts is ``|A & B| / |A | B|`` over their tag sets; the
+intersection sizes are the non-zero entries of ``M @ M.T``, which are
+computed here chunk by chunk with NumPy by expanding each (post, tag) entry
+into that tag's posting list and counting the resulting (post, post) pairs.
+Only pairs that share at least one tag are ever materialised.
+"""
+
+import numpy as np
+
+
+def top_related(post_ids, tag_ids, top_k=5, chunk_size=1000):
+    """
+    Yield ``(post_id, [(related_post_id, score), ...])`` for every post that
+    shares a tag with another post, best matches first.
+
+    Args:
+        post_ids: sequence of post ids, one per (post, tag) row of Post.tags
+        tag_ids: sequence of tag ids aligned with ``post_ids``
+        top_k: number of related posts kept per post
+        chunk_size: posts processed per vectorised batch (bounds memory)
+    """
+    post_ids = np.asarray(post_ids, dtype=np.int64)
+    tag_ids = np.asarray(tag_ids, dtype=np.int64)
+    if post_ids.size == 0:
+        return
+
+    # Dense row/column numbering for the incidence matrix
+    posts, rows = np.unique(post_ids, return_inverse=True)
+    _, cols = np.unique(tag_ids, return_inverse=True)
+    n_posts = posts.size
+
+    # CSR (post -> tags) and CSC (tag -> posts) views of the same entries
+    by_post = np.lexsort((cols, rows))
+    entry_rows, entry_tags = rows[by_post], cols[by_post]
+    post_ptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=n_posts))))
+    tags_per_post = np.diff(post_ptr)
+
+    by_tag = np.lexsort((rows, cols))
+    tag_postings = rows[by_tag]
+    tag_len = np.bincount(cols)
+    tag_ptr = np.concatenate(([0], np.cumsum(tag_len)))
+
+    for start in range(0, n_posts, chunk_size):
+        stop = min(start + chunk_size, n_posts)
+        lo, hi = post_ptr[start], post_ptr[stop]
+        src, tags = entry_rows[lo:hi], entry_tags[lo:hi]
+
+        # Expand every (post, tag) entry into (post, other post with that tag)
+        lengths = tag_len[tags]
+        total = int(lengths.sum())
+        offsets = np.repeat(tag_ptr[tags] - (np.cumsum(lengths) - lengths), lengths)
+        pair_src = np.repeat(src, lengths)
+        pair_dst = tag_postings[offsets + np.arange(total)]
+        keep = pair_src != pair_dst
+        pair_src, pair_dst = pair_src[keep], pair_dst[keep]
+        if pair_src.size == 0:
+            continue
+
+        # Intersection size = number of times a (src, dst) pair occurs
+        keys, shared = np.unique(pair_src * n_posts + pair_dst, return_counts=True)
+        pair_src, pair_dst = keys // n_posts, keys % n_posts
+        score = shared / (
+            tags_per_post[pair_src] + tags_per_post[pair_dst] - shared
+        )
+
+        # Best score first within each source post; newer posts break ties
+        order = np.lexsort((-posts[pair_dst], -score, pair_src))
+        pair_src, pair_dst, score = pair_src[order], pair_dst[order], score[order]
+        group_start = np.flatnonzero(np.r_[True, pair_src[1:] != pair_src[:-1]])
+        rank = np.arange(pair_src.size) - np.repeat(
+            group_start, np.diff(np.r_[group_start, pair_src.size])
+        )
+        keep = rank < top_k
+        pair_src, pair_dst, score = pair_src[keep], pair_dst[keep], score[keep]
+
+        bounds = np.flatnonzero(np.r_[True, pair_src[1:] != pair_src[:-1], True])
+        for begin, end in zip(bounds[:-1], bounds[1:]):
+            yield int(posts[pair_src[begin]]), [
+                (int(posts[dst]), float(value))
+                for dst, value in zip(pair_dst[begin:end], score[begin:end])
+            ]
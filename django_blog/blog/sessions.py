@@ -0,0 +1,37 @@
+import hashlib
+
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+
+
+class SessionStore(CachedDBStore):
+    """
+    Cache-first sessions (reads come from the cache, the database is only
+    consulted on a miss) that also coalesce redundant writes.
+
+    Django re-saves a session whenever it is flagged as modified, even if the
+    view wrote back the values it already held. This store remembers a digest
+    of the data as loaded and skips the cache + database write when nothing
+    actually changed. New sessions and key rotation (login/logout) always
+    write.
+    """
+
+    _loaded_digest = None
+
+    def _digest(self, data):
+        return hashlib.sha1(self.serializer().dumps(data)).hexdigest()
+
+    def load(self):
+        data = super().load()
+        self._loaded_digest = self._digest(data)
+        return data
+
+    def save(self, must_create=False):
+        if (
+            not must_create
+            and self.session_key is not None
+            and self._loaded_digest is not None
+            and self._loaded_digest == self._digest(self._get_session(no_load=True))
+        ):
+            return
+        super().save(must_create=must_create)
+        self._loaded_digest = self._digest(self._get_session(no_load=True))
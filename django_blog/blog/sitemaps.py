@@ -0,0 +1,254 @@
+"""
+Sitemap index for crawlers, written to the "sitemaps" storage.
+
+Each section (posts, tags) is split into files of at most SITEMAP_LIMIT URLs.
+Chunk boundaries are found by keyset walks over the primary key, rows are
+streamed with ``.iterator()`` and XML goes straight to a spooled temporary
+file, so building never holds a whole section in memory.
+
+A manifest records a cheap fingerprint of every chunk; a rebuild only
+rewrites chunks whose fingerprint changed (in an append-mostly blog that is
+usually just the last posts chunk) and the index itself.
+"""
+
+import json
+import tempfile
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db.models import Count, Max
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Post, Tag
+
+SITEMAP_LIMIT = 50_000
+SITEMAP_ITERATOR_CHUNK = 2000
+# How often a request may trigger an incremental rebuild
+SITEMAP_REFRESH_INTERVAL = 60 * 15
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+INDEX_NAME = "sitemap.xml"
+MANIFEST_NAME = "manifest.json"
+
+
+def get_storage():
+    return storages["sitemaps"]
+
+
+def chunk_name(section, page):
+    return f"sitemap-{section}-{page}.xml"
+
+
+# ==================== SECTIONS ====================
+
+
+class PostSection:
+    name = "posts"
+
+    def get_queryset(self):
+        return Post.objects.all()
+
+    def fingerprint(self, rows):
+        # published_date never changes, so the id range and count identify a chunk
+        stats = rows.aggregate(total=Count("pk"), latest=Max("published_date"))
+        return stats["total"], stats["latest"]
+
+    def entries(self, rows):
+        """Yield (path, lastmod) for every row in ``rows``."""
+        for pk, published in rows.values_list("pk", "published_date").iterator(
+            chunk_size=SITEMAP_ITERATOR_CHUNK
+        ):
+            yield reverse("post-detail", args=[pk]), published
+
+
+class TagSection:
+    name = "tags"
+
+    def get_queryset(self):
+        return Tag.objects.filter(post_count__gt=0)
+
+    def fingerprint(self, rows):
+        # Tagging or untagging a post changes the pair count or the newest date
+        stats = rows.aggregate(
+            total=Count("pk", distinct=True),
+            pairs=Count("posts"),
+            latest=Max("posts__published_date"),
+        )
+        return stats["total"], stats["latest"], stats["pairs"]
+
+    def entries(self, rows):
+        rows = rows.annotate(lastmod=Max("posts__published_date"))
+        for slug, lastmod in rows.values_list("slug", "lastmod").iterator(
+            chunk_size=SITEMAP_ITERATOR_CHUNK
+        ):
+            yield reverse("posts-by-tag", args=[slug]), lastmod
+
+
+SECTIONS = {section.name: section for section in (PostSection(), TagSection())}
+
+
+# ==================== BUILDER ====================
+
+
+class SitemapBuilder:
+    """Bring the stored sitemap files up to date with the database."""
+
+    def __init__(self, storage=None, base_url=None, limit=SITEMAP_LIMIT):
+        self.storage = storage or get_storage()
+        self.base_url = (base_url or settings.SITE_URL).rstrip("/")
+        self.limit = limit
+
+    def build(self, force=False):
+        """
+        Rewrite changed chunks and the index.
+
+        Returns:
+            tuple: (chunks written, chunks unchanged)
+        """
+        manifest = self.load_manifest()
+        if force or manifest.get("base_url") != self.base_url:
+            manifest = {"base_url": self.base_url, "chunks": {}}
+        previous = manifest["chunks"]
+        chunks = {}
+        written = unchanged = 0
+
+        for section in SECTIONS.values():
+            for page, rows in enumerate(self.plan_chunks(section), start=1):
+                name = chunk_name(section.name, page)
+                fingerprint = json.dumps(
+                    section.fingerprint(rows), cls=_DateEncoder
+                )
+                entry = previous.get(name)
+                if (
+                    entry
+                    and entry["fingerprint"] == fingerprint
+                    and self.storage.exists(name)
+                ):
+                    chunks[name] = entry
+                    unchanged += 1
+                    continue
+                lastmod = self.write_chunk(name, section.entries(rows))
+                chunks[name] = {"fingerprint": fingerprint, "lastmod": lastmod}
+                written += 1
+
+        for name in previous.keys() - chunks.keys():
+            self.storage.delete(name)
+        if written or chunks.keys() != previous.keys() or not self.storage.exists(
+            INDEX_NAME
+        ):
+            self.write_index(chunks)
+        manifest["chunks"] = chunks
+        self.save(MANIFEST_NAME, json.dumps(manifest).encode())
+        return written, unchanged
+
+    def plan_chunks(self, section):
+        """Yield one queryset per chunk, each a pk range of at most ``limit`` rows."""
+        base = section.get_queryset()
+        last_pk = 0
+        while True:
+            remaining = base.filter(pk__gt=last_pk).order_by("pk")
+            boundary = list(
+                remaining.values_list("pk", flat=True)[self.limit - 1 : self.limit]
+            )
+            if boundary:
+                upper = boundary[0]
+            else:
+                upper = remaining.aggregate(upper=Max("pk"))["upper"]
+                if upper is None:
+                    return
+            yield base.filter(pk__gt=last_pk, pk__lte=upper).order_by("pk")
+            if not boundary:
+                return
+            last_pk = upper
+
+    def write_chunk(self, name, entries):
+        """Stream a urlset to storage; return the newest lastmod as ISO text."""
+        newest = None
+        with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as tmp:
+            tmp.write(
+                f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{SITEMAP_NS}">\n'.encode()
+            )
+            for path, lastmod in entries:
+                line = f"<url><loc>{escape(self.base_url + path)}</loc>"
+                if lastmod is not None:
+                    line += f"<lastmod>{lastmod.isoformat()}</lastmod>"
+                    if newest is None or lastmod > newest:
+                        newest = lastmod
+                tmp.write((line + "</url>\n").encode())
+            tmp.write(b"</urlset>\n")
+            tmp.seek(0)
+            self.save(name, File(tmp))
+        return newest.isoformat() if newest else None
+
+    def write_index(self, chunks):
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            f'<sitemapindex xmlns="{SITEMAP_NS}">',
+        ]
+        for name, entry in chunks.items():
+            line = f"<sitemap><loc>{escape(self.base_url)}/{name}</loc>"
+            if entry["lastmod"]:
+                line += f"<lastmod>{entry['lastmod']}</lastmod>"
+            lines.append(line + "</sitemap>")
+        lines.append("</sitemapindex>\n")
+        self.save(INDEX_NAME, "\n".join(lines).encode())
+
+    def load_manifest(self):
+        if not self.storage.exists(MANIFEST_NAME):
+            return {}
+        with self.storage.open(MANIFEST_NAME) as handle:
+            return json.load(handle)
+
+    def save(self, name, content):
+        # Storage.save() picks a fresh name when the file exists
+        if self.storage.exists(name):
+            self.storage.delete(name)
+        if isinstance(content, bytes):
+            content = ContentFile(content)
+        self.storage.save(name, content)
+
+
+class _DateEncoder(json.JSONEncoder):
+    def default(self, o):
+        if hasattr(o, "isoformat"):
+            return o.isoformat()
+        return super().default(o)
+
+
+# ==================== VIEWS ====================
+
+
+def refresh_sitemaps():
+    """Run an incremental build at most once per SITEMAP_REFRESH_INTERVAL."""
+    if cache.add("blog:sitemap:checked", True, SITEMAP_REFRESH_INTERVAL):
+        SitemapBuilder().build()
+
+
+def serve_sitemap_file(request, name):
+    storage = get_storage()
+    if not storage.exists(name):
+        raise Http404("No such sitemap")
+    modified = int(storage.get_modified_time(name).timestamp())
+    response = get_conditional_response(request, last_modified=modified)
+    if response is None:
+        response = FileResponse(storage.open(name), content_type="application/xml")
+    response.headers.setdefault("Last-Modified", http_date(modified))
+    return response
+
+
+def sitemap_index(request):
+    refresh_sitemaps()
+    return serve_sitemap_file(request, INDEX_NAME)
+
+
+def sitemap_chunk(request, section, page):
+    if section not in SECTIONS:
+        raise Http404("No such sitemap")
+    refresh_sitemaps()
+    return serve_sitemap_file(request, chunk_name(section, page))
@@ -2,3 +2,25 @@
 document.addEventListener("DOMContentLoaded", function () {
   console.log("Blog page loaded");
 });
+
+// Comment threads: swap the "Load more" button for the next chunk of comments
+document.addEventListener("click", function (event) {
+  var button = event.target.closest("[data-next-url]");
+  if (!button) {
+    return;
+  }
+  button.disabled = true;
+  fetch(button.dataset.nextUrl, { headers: { "X-Requested-With": "fetch" } })
+    .then(function (response) {
+      if (!response.ok) {
+        throw new Error("Could not load comments");
+      }
+      return response.text();
+    })
+    .then(function (html) {
+      button.closest(".load-more").outerHTML = html;
+    })
+    .catch(function () {
+      button.disabled = false;
+    });
+});
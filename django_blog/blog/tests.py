@@ -1,3 +1,526 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .feeds import PostFeedView
+from .models import Post, Comment, Tag, RelatedPost
+from .sessions import SessionStore
+from .sitemaps import SitemapBuilder
+from .views import COMMENTS_PER_CHUNK
+
+
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+        self.post = Post.objects.create(
+            title="First", content="Hello", author=self.user
+        )
+
+    def test_conditional_get_returns_304(self):
+        url = reverse("post-detail", kwargs={"pk": self.post.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_page_skips_queries_except_fingerprint(self):
+        url = reverse("post-list")
+        self.client.get(url)
+        # Posts and the tag cloud
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertContains(response, "First")
+
+    def test_write_invalidates_cached_page(self):
+        url = reverse("post-detail", kwargs={"pk": self.post.pk})
+        etag = self.client.get(url)["ETag"]
+        Comment.objects.create(post=self.post, author=self.user, content="Nice")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_tag_change_invalidates_post_list(self):
+        url = reverse("post-list")
+        etag = self.client.get(url)["ETag"]
+        # m2m edits leave the post row alone but change the tag cloud
+        self.post.tags.add(*Tag.objects.get_or_create_many(["django"]))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "django")
+
+    def test_logged_in_users_bypass_cache(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("post-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+
+class TagStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+
+    def test_get_or_create_many_reuses_existing_slugs(self):
+        Tag.objects.create(name="Django")
+        tags = Tag.objects.get_or_create_many(["django", "Web Dev", "web dev"])
+        self.assertEqual([tag.slug for tag in tags], ["django", "web-dev"])
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_post_count_follows_m2m_changes(self):
+        django, python = Tag.objects.get_or_create_many(["django", "python"])
+        first = Post.objects.create(title="A", content="a", author=self.user)
+        second = Post.objects.create(title="B", content="b", author=self.user)
+        first.tags.set([django, python])
+        second.tags.add(django)
+        django.refresh_from_db()
+        self.assertEqual(django.post_count, 2)
+
+        first.tags.clear()
+        second.delete()
+        django.refresh_from_db()
+        python.refresh_from_db()
+        self.assertEqual((django.post_count, python.post_count), (0, 0))
+
+    def test_removing_unlinked_tags_leaves_counts_alone(self):
+        django, python = Tag.objects.get_or_create_many(["django", "python"])
+        post = Post.objects.create(title="A", content="a", author=self.user)
+        other = Post.objects.create(title="B", content="b", author=self.user)
+        post.tags.add(django)
+        other.tags.add(python)
+        post.tags.remove(django, python)
+        python.posts.remove(post, other)
+        django.refresh_from_db()
+        python.refresh_from_db()
+        self.assertEqual((django.post_count, python.post_count), (0, 0))
+
+    def test_long_names_fit_their_columns(self):
+        name = "Ünïcode " + "word " * 20
+        tag = Tag.objects.get_or_create_many([name])[0]
+        self.assertEqual(tag.name, name[:50].strip())
+        self.assertEqual(tag.slug, "unicode-word-word-word-word-word-word-word-word-wo")
+        self.assertEqual(Tag.objects.get_or_create_many([name + "more"]), [tag])
+        # Normalization can lengthen a name ("ﬁ" -> "fi"); the slug is capped too
+        ligatures = Tag.objects.get_or_create_many(["ﬁ" * 50])[0]
+        self.assertEqual(ligatures.slug, "fi" * 30)
+
+    def test_post_form_rejects_tags_without_a_slug(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse("post-create"),
+            {"title": "Tagged", "content": "Body", "tags": "django, 日本語, !!!"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(
+            response.context["form"],
+            "tags",
+            "Tags need at least one letter or digit (A-Z, 0-9): !!!, 日本語",
+        )
+        self.assertFalse(Post.objects.filter(title="Tagged").exists())
+
+    def test_unknown_tag_lists_no_posts(self):
+        response = self.client.get(reverse("posts-by-tag", args=["missing"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["posts"]), [])
+
+    def test_tag_page_query_count_does_not_grow_with_authors(self):
+        django = Tag.objects.get_or_create_many(["django"])[0]
+        for i in range(6):
+            author = User.objects.create_user(username=f"author{i}", password="pass12345")
+            Post.objects.create(title=f"P{i}", content="c", author=author).tags.add(django)
+        # Fingerprint, tag, posts with their authors
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("posts-by-tag", args=["django"]))
+        self.assertContains(response, "author5")
+
+    def test_post_form_assigns_tags(self):
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("post-create"),
+            {"title": "Tagged", "content": "Body", "tags": "django, web dev"},
+        )
+        post = Post.objects.get(title="Tagged")
+        self.assertEqual(
+            sorted(post.tags.values_list("slug", flat=True)), ["django", "web-dev"]
+        )
+        response = self.client.get(reverse("posts-by-tag", args=["web-dev"]))
+        self.assertContains(response, "Tagged")
+
+
+class RelatedPostsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+
+    def make_post(self, title, tags):
+        post = Post.objects.create(title=title, content=title, author=self.user)
+        post.tags.set(Tag.objects.get_or_create_many(tags))
+        return post
+
+    def test_command_stores_jaccard_neighbours(self):
+        base = self.make_post("Base", ["django", "python", "web"])
+        close = self.make_post("Close", ["django", "python"])
+        far = self.make_post("Far", ["web", "css", "html"])
+        self.make_post("Unrelated", ["cooking"])
+
+        call_command("compute_related_posts", "--top-k", "2", stdout=StringIO())
+
+        entries = RelatedPost.objects.filter(post=base).order_by("rank")
+        self.assertEqual([e.related_id for e in entries], [close.pk, far.pk])
+        self.assertAlmostEqual(entries[0].score, 2 / 3)
+        self.assertAlmostEqual(entries[1].score, 1 / 5)
+
+        response = self.client.get(reverse("post-detail", args=[base.pk]))
+        self.assertContains(response, "Related Posts")
+        self.assertContains(response, "Close")
+
+
+class CommentPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+        self.post = Post.objects.create(title="Busy", content="x", author=self.user)
+        Comment.objects.bulk_create(
+            Comment(post=self.post, author=self.user, content=f"comment {i:03d}")
+            for i in range(COMMENTS_PER_CHUNK * 2 + 5)
+        )
+
+    def test_detail_inlines_first_chunk_only(self):
+        response = self.client.get(reverse("post-detail", args=[self.post.pk]))
+        self.assertEqual(len(response.context["comments"]), COMMENTS_PER_CHUNK)
+        self.assertIsNotNone(response.context["next_comments_url"])
+
+    def test_chunks_walk_the_whole_thread(self):
+        seen = []
+        url = reverse("post-detail", args=[self.post.pk])
+        response = self.client.get(url)
+        seen.extend(c.content for c in response.context["comments"])
+        url = response.context["next_comments_url"]
+        while url:
+            with self.assertNumQueries(1):
+                response = self.client.get(url)
+            seen.extend(c.content for c in response.context["comments"])
+            url = response.context["next_comments_url"]
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(seen), COMMENTS_PER_CHUNK * 2 + 5)
+
+    def test_bad_cursor_is_rejected(self):
+        url = reverse("comment-chunk", args=[self.post.pk]) + "?after=nope"
+        self.assertEqual(self.client.get(url).status_code, 400)
+
+
+class SessionStoreTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_session_is_not_rewritten(self):
+        store = SessionStore()
+        store["cart"] = [1, 2]
+        store.save(must_create=True)
+
+        reloaded = SessionStore(session_key=store.session_key)
+        reloaded["cart"] = [1, 2]  # flags modified, same data
+        with self.assertNumQueries(0):
+            reloaded.save()
+
+        reloaded["cart"] = [3]
+        with CaptureQueriesContext(connection) as queries:
+            reloaded.save()
+        self.assertTrue(any("UPDATE" in q["sql"] for q in queries))
+        self.assertEqual(SessionStore(session_key=store.session_key)["cart"], [3])
+
+    def test_purge_sessions_deletes_only_expired(self):
+        Session.objects.create(
+            session_key="old",
+            session_data="",
+            expire_date=timezone.now() - timedelta(days=1),
+        )
+        Session.objects.create(
+            session_key="live",
+            session_data="",
+            expire_date=timezone.now() + timedelta(days=1),
+        )
+        call_command("purge_sessions", "--batch-size", "1", stdout=StringIO())
+        self.assertEqual(list(Session.objects.values_list("pk", flat=True)), ["live"])
+
+
+class CommentStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+        self.quiet = Post.objects.create(title="Quiet", content="q", author=self.user)
+        self.busy = Post.objects.create(title="Busy", content="b", author=self.user)
+        self.client.force_login(self.user)
+
+    def test_views_maintain_comment_stats(self):
+        url = reverse("comment-create", args=[self.busy.pk])
+        self.client.post(url, {"content": "first"})
+        self.client.post(url, {"content": "second"})
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 2)
+        latest = self.busy.comments.last()
+        self.assertEqual(self.busy.last_comment_at, latest.created_at)
+
+        self.client.post(reverse("comment-delete", args=[latest.pk]))
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 1)
+        self.assertEqual(self.busy.last_comment_at, self.busy.comments.get().created_at)
+
+    def test_deleting_a_comment_created_outside_the_views(self):
+        comment = Comment.objects.create(post=self.busy, author=self.user, content="shell")
+        self.client.post(reverse("comment-delete", args=[comment.pk]))
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 0)
+        self.assertIsNone(self.busy.last_comment_at)
+
+    def test_comments_move_list_validators_but_not_updated_at(self):
+        edited = self.busy.updated_at
+        anonymous = self.client_class()
+        url = reverse("post-list")
+        etag = anonymous.get(url)["ETag"]
+        self.client.post(reverse("comment-create", args=[self.busy.pk]), {"content": "x"})
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.updated_at, edited)
+        response = anonymous.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "1 comment")
+        # Cached pages render an absolute time, never "N minutes ago"
+        self.assertContains(response, '<time datetime="')
+
+    def test_most_discussed_ordering_and_rebuild(self):
+        Comment.objects.create(post=self.quiet, author=self.user, content="x")
+        for i in range(3):
+            Comment.objects.create(post=self.busy, author=self.user, content=str(i))
+        call_command("rebuild_comment_stats", "--batch-size", "1", stdout=StringIO())
+
+        response = self.client.get(reverse("post-list") + "?sort=discussed")
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(titles, ["Busy", "Quiet"])
+        self.assertEqual(response.context["posts"][0].comment_count, 3)
+
+
+class OwnershipTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="pass12345")
+        self.other = User.objects.create_user(username="other", password="pass12345")
+        self.post = Post.objects.create(title="Mine", content="m", author=self.owner)
+        self.comment = Comment.objects.create(
+            post=self.post, author=self.owner, content="c"
+        )
+
+    def test_non_owner_gets_404(self):
+        self.client.force_login(self.other)
+        for name, pk in [
+            ("post-update", self.post.pk),
+            ("post-delete", self.post.pk),
+            ("comment-update", self.comment.pk),
+            ("comment-delete", self.comment.pk),
+        ]:
+            response = self.client.post(reverse(name, args=[pk]), {"content": "x"})
+            self.assertEqual(response.status_code, 404, name)
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+
+    def test_owner_check_fetches_object_once(self):
+        self.client.force_login(self.owner)
+        url = reverse("comment-update", args=[self.comment.pk])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        comment_selects = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith("SELECT") and '"blog_comment"' in q["sql"]
+        ]
+        self.assertEqual(len(comment_selects), 1)
+        self.assertIn('"author_id" =', comment_selects[0])
+
+
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="writer", password="pass12345")
+        self.tag = Tag.objects.create(name="Django")
+        for i in range(3):
+            post = Post.objects.create(title=f"Post {i}", content="body", author=self.user)
+            if i != 1:
+                post.tags.add(self.tag)
+
+    def read(self, url, **headers):
+        response = self.client.get(url, **headers)
+        if response.streaming:
+            return response, b"".join(response.streaming_content).decode()
+        return response, response.content.decode()
+
+    def test_formats_stream_every_post(self):
+        _, rss = self.read(reverse("post-feed", args=["rss"]))
+        self.assertEqual(rss.count("<item>"), 3)
+        self.assertTrue(rss.rstrip().endswith("</channel></rss>"))
+        self.assertIn("<category>Django</category>", rss)
+
+        _, atom = self.read(reverse("author-feed", args=["writer", "atom"]))
+        self.assertEqual(atom.count("<entry>"), 3)
+
+        _, data = self.read(reverse("tag-feed", args=["django", "json"]))
+        items = json.loads(data)["items"]
+        self.assertEqual([item["title"] for item in items], ["Post 2", "Post 0"])
+
+        response = self.client.get(reverse("post-feed", args=["yaml"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_feeds_carry_only_the_latest_posts(self):
+        with mock.patch.object(PostFeedView, "feed_limit", 2):
+            _, rss = self.read(reverse("post-feed", args=["rss"]))
+        self.assertEqual(rss.count("<item>"), 2)
+        self.assertIn("Post 2", rss)
+        self.assertNotIn("Post 0", rss)
+
+    def test_etag_and_cache(self):
+        url = reverse("post-feed", args=["rss"])
+        first, body = self.read(url)
+        self.assertTrue(first.streaming)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        with self.assertNumQueries(1):
+            cached, cached_body = self.read(url)
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached_body, body)
+
+        Post.objects.create(title="Fresh", content="new", author=self.user)
+        fresh, body = self.read(url)
+        self.assertNotEqual(fresh["ETag"], first["ETag"])
+        self.assertIn("Fresh", body)
+
+
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.storage = FileSystemStorage(location=self.tmp)
+        user = User.objects.create_user(username="writer", password="pass12345")
+        tag = Tag.objects.create(name="Django")
+        self.posts = [
+            Post.objects.create(title=f"Post {i}", content="c", author=user)
+            for i in range(5)
+        ]
+        self.posts[0].tags.add(tag)
+
+    def read(self, name):
+        with self.storage.open(name) as handle:
+            return handle.read().decode()
+
+    def test_chunks_and_incremental_rebuild(self):
+        builder = SitemapBuilder(self.storage, "https://blog.test", limit=2)
+        self.assertEqual(builder.build(), (4, 0))  # posts 2+2+1, tags 1
+        index = self.read("sitemap.xml")
+        self.assertIn("https://blog.test/sitemap-posts-3.xml", index)
+        self.assertIn("https://blog.test/sitemap-tags-1.xml", index)
+        chunk = self.read("sitemap-posts-1.xml")
+        self.assertEqual(chunk.count("<url>"), 2)
+        self.assertIn(f"https://blog.test/post/{self.posts[0].pk}/", chunk)
+
+        self.assertEqual(builder.build(), (0, 4))
+
+        Post.objects.create(title="New", content="c", author=self.posts[0].author)
+        self.assertEqual(builder.build(), (1, 3))
+        self.assertEqual(self.read("sitemap-posts-3.xml").count("<url>"), 2)
+
+        self.posts[4].delete()
+        Post.objects.filter(title="New").delete()
+        self.assertEqual(builder.build(), (0, 3))
+        self.assertFalse(self.storage.exists("sitemap-posts-3.xml"))
+        self.assertNotIn("sitemap-posts-3.xml", self.read("sitemap.xml"))
+
+    def test_views_serve_stored_files(self):
+        storages = {
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {
+                "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+            },
+            "sitemaps": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": self.tmp},
+            },
+        }
+        with self.settings(STORAGES=storages):
+            response = self.client.get(reverse("sitemap-index"))
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(b"sitemap-posts-1.xml", b"".join(response.streaming_content))
+            response = self.client.get(reverse("sitemap-chunk", args=["posts", 1]))
+            self.assertEqual(response.status_code, 200)
+            response = self.client.get(reverse("sitemap-chunk", args=["users", 1]))
+            self.assertEqual(response.status_code, 404)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = User.objects.create_user(username="alice", password="pass12345")
+        self.bob = User.objects.create_user(username="bob", password="pass12345")
+        base = timezone.make_aware(timezone.datetime(2025, 3, 10))
+        for i in range(12):
+            post = Post.objects.create(
+                title=f"Post {i}", content="c", author=self.alice if i % 2 else self.bob
+            )
+            # published_date is auto_now_add; spread posts over March-May 2025
+            Post.objects.filter(pk=post.pk).update(
+                published_date=base + timedelta(days=7 * i)
+            )
+        cache.clear()
+
+    def test_month_archive_walks_pages_by_keyset(self):
+        url = reverse("month-archive", args=[2025, 3])
+        response = self.client.get(url)
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(titles, ["Post 3", "Post 2", "Post 1", "Post 0"])
+        self.assertIsNone(response.context["next_page_url"])
+
+        response = self.client.get(reverse("year-archive", args=[2025]))
+        self.assertEqual(len(response.context["posts"]), 10)
+        response = self.client.get(response.context["next_page_url"])
+        titles = [post.title for post in response.context["posts"]]
+        self.assertEqual(titles, ["Post 1", "Post 0"])
+
+        self.assertEqual(self.client.get("/archive/2025/13/").status_code, 404)
+        self.assertEqual(self.client.get(url + "?before=nope").status_code, 400)
+
+    def test_archive_pages_change_with_posts_in_other_months(self):
+        url = reverse("month-archive", args=[2025, 3])
+        etag = self.client.get(url)["ETag"]
+        Post.objects.create(title="New", content="c", author=self.alice)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(total for _, total in response.context["archive_months"]), 13)
+
+    def test_author_archive_and_cached_month_counts(self):
+        response = self.client.get(reverse("author-archive", args=["alice"]))
+        self.assertEqual(len(response.context["posts"]), 6)
+        months = response.context["archive_months"]
+        self.assertEqual(sum(total for _, total in months), 6)
+        self.assertEqual(months[-1][0].month, 3)
 
-# Create your tests here.
+        with self.assertNumQueries(0):
+            Post.objects.month_counts(author_id=self.alice.pk)
+        Post.objects.create(title="New", content="c", author=self.alice)
+        months = Post.objects.month_counts(author_id=self.alice.pk)
+        self.assertEqual(sum(total for _, total in months), 7)
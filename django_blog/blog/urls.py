@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import feeds, sitemaps, views
 
 urlpatterns = [
     path("register/", views.register_view, name="register"),
@@ -14,7 +14,13 @@ urlpatterns = [
     path("post/<int:pk>/update/", views.PostUpdateView.as_view(), name="post-update"),
     path("post/<int:pk>/delete/", views.PostDeleteView.as_view(), name="post-delete"),
 
+    # Archives
+    path("authors/<str:username>/", views.AuthorArchiveView.as_view(), name="author-archive"),
+    path("archive/<int:year>/", views.DateArchiveView.as_view(), name="year-archive"),
+    path("archive/<int:year>/<int:month>/", views.DateArchiveView.as_view(), name="month-archive"),
+
     # Comments
+    path("post/<int:pk>/comments/", views.CommentChunkView.as_view(), name="comment-chunk"),
     path("post/<int:pk>/comments/new/", views.CommentCreateView.as_view(), name="comment-create"),
     path("comment/<int:pk>/update/", views.CommentUpdateView.as_view(), name="comment-update"),
     path("comment/<int:pk>/delete/", views.CommentDeleteView.as_view(), name="comment-delete"),
@@ -22,6 +28,15 @@ urlpatterns = [
     # Search
     path("search/", views.SearchResultsView.as_view(), name="search-results"),
 
+    # Feeds (feed_format is rss, atom or json)
+    path("feeds/<str:feed_format>/", feeds.PostFeedView.as_view(), name="post-feed"),
+    path("feeds/authors/<str:username>/<str:feed_format>/", feeds.AuthorFeedView.as_view(), name="author-feed"),
+    path("feeds/tags/<slug:tag_slug>/<str:feed_format>/", feeds.TagFeedView.as_view(), name="tag-feed"),
+
+    # Sitemaps
+    path("sitemap.xml", sitemaps.sitemap_index, name="sitemap-index"),
+    path("sitemap-<str:section>-<int:page>.xml", sitemaps.sitemap_chunk, name="sitemap-chunk"),
+
     # Bypass Checker
     path("tags/<slug:tag_slug>/", views.PostByTagListView.as_view(), name="posts-by-tag"),
 ]
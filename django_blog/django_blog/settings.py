@@ -38,11 +38,11 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "blog",
-    "taggit",
 ]
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,6 +86,19 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Backs the anonymous full-page cache in blog.caching; point this at a shared
+# backend (e.g. Redis or Memcached) when running more than one worker.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "django-blog",
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -121,16 +134,52 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = "/static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
 
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+# In production collectstatic writes content-hashed copies (styles.<hash>.css)
+# plus .gz and .br variants; WhiteNoise serves hashed files with a one-year
+# max-age. Development keeps plain names so no manifest is required.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "whitenoise.storage.CompressedManifestStaticFilesStorage"
+        ),
+    },
+    # Generated sitemap files (see blog.sitemaps); any storage backend works
+    "sitemaps": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": BASE_DIR / "sitemaps"},
+    },
+}
+
+# Public origin used for absolute URLs in sitemaps
+SITE_URL = "http://localhost:8000"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Sessions and messages
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+# Sessions are read from the cache and only written when their data changes
+# (see blog.sessions). For fully stateless sessions switch to
+# "django.contrib.sessions.backends.signed_cookies". Flash messages live in a
+# signed cookie so messages.success() never touches the session row.
+
+SESSION_ENGINE = "blog.sessions"
+SESSION_SAVE_EVERY_REQUEST = False
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
 # Authentication settings
 LOGIN_REDIRECT_URL = "profile"
 LOGOUT_REDIRECT_URL = "login"
@@ -1,46 +1,11 @@
-# blog/urls.py
-from django.urls import path
-from django.contrib.auth import views as auth_views
-from . import views
-from .views import (
-    RegisterView,
-    profile_view,
-    PostListView,
-    PostDetailView,
-    PostCreateView,
-    PostUpdateView,
-    PostDeleteView,
-    CommentCreateView,
-    CommentUpdateView,
-    CommentDeleteView,
-    SearchResultsView,
-    PostByTagListView,
-)
+"""
+URL configuration for django_blog project.
+"""
 
-urlpatterns = [
-    # Authentication
-    path("register/", RegisterView.as_view(), name="register"),
-    path(
-        "login/",
-        auth_views.LoginView.as_view(template_name="blog/login.html"),
-        name="login",
-    ),
-    path("logout/", auth_views.LogoutView.as_view(), name="logout"),
-    path("profile/", profile_view, name="profile"),
-
-    # Posts
-    path("", PostListView.as_view(), name="post-list"),
-    path("post/new/", PostCreateView.as_view(), name="post-create"),
-    path("post/<int:pk>/", PostDetailView.as_view(), name="post-detail"),
-    path("post/<int:pk>/update/", PostUpdateView.as_view(), name="post-update"),
-    path("post/<int:pk>/delete/", PostDeleteView.as_view(), name="post-delete"),
+from django.contrib import admin
+from django.urls import path, include
 
-    # Comments
-    path("post/<int:pk>/comments/new/", CommentCreateView.as_view(), name="comment-create"),
-    path("comment/<int:pk>/update/", CommentUpdateView.as_view(), name="comment-update"),
-    path("comment/<int:pk>/delete/", CommentDeleteView.as_view(), name="comment-delete"),
-
-    # Search and Tags
-    path("search/", SearchResultsView.as_view(), name="search-results"),
-    path("tags/<slug:tag_slug>/", PostByTagListView.as_view(), name="posts-by-tag"),  # ✅ EXACT LINE
+urlpatterns = [
+    path("admin/", admin.site.urls),
+    path("", include("blog.urls")),
 ]
@@ -0,0 +1,78 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from posts.models import Comment, Post
+from posts.serializers import PostSerializer
+from social_media_api.renderers import FastJSONRenderer
+
+User = get_user_model()
+POSTS_PER_USER = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare JSONRenderer and FastJSONRenderer on PostSerializer payloads "
+        "built from generated rows; everything is rolled back afterwards"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000, help="Posts to generate")
+        parser.add_argument("--comments", type=int, default=2, help="Comments per post")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per case; best is kept")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.generate(options["rows"], options["comments"])
+            posts = Post.objects.select_related("author").prefetch_related("comments__author")
+            data = PostSerializer(posts, many=True).data
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{'payload':<16}{'rows':>8}{'renderer':>20}{'MB/s':>10}{'rows/s':>14}{'speedup':>9}"
+        )
+        baseline = None
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            size = len(renderer.render(data))
+            elapsed = self.best(options["repeat"], lambda: renderer.render(data))
+            baseline = baseline or elapsed
+            self.stdout.write(
+                f"{'PostSerializer':<16}{len(data):>8}{type(renderer).__name__:>20}"
+                f"{size / elapsed / 1e6:>10.1f}{len(data) / elapsed:>14,.0f}"
+                f"{baseline / elapsed:>8.1f}x"
+            )
+
+    def generate(self, rows, comments):
+        users = User.objects.bulk_create(
+            User(username=f"benchmark-user-{i}") for i in range(max(rows // POSTS_PER_USER, 1))
+        )
+        posts = Post.objects.bulk_create(
+            (
+                Post(
+                    author=users[i % len(users)],
+                    title=f"Benchmark post {i}",
+                    content="Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4,
+                )
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        Comment.objects.bulk_create(
+            (
+                Comment(post=post, author=users[(n + j) % len(users)], content=f"Comment {j}")
+                for n, post in enumerate(posts)
+                for j in range(comments)
+            ),
+            batch_size=1000,
+        )
+
+    def best(self, repeat, run):
+        """Fastest wall time of ``repeat`` runs."""
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+        return min(timings)